@@ -1,8 +1,17 @@
-import pygame
 import os
 
 class AudioManager:
-    def __init__(self):
+    def __init__(self, enabled=True):
+        # Headless runs (build machines) usually have no audio device at all
+        self.enabled = enabled
+        self.is_charging = False
+        if not enabled:
+            return
+
+        # pygame is only imported when audio is actually wanted (it's a slow import)
+        import pygame
+        self.mixer = pygame.mixer
+
         # Initialize the pygame mixer
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
         
@@ -20,19 +29,26 @@ class AudioManager:
     def play_fire(self):
         """Plays the deep repulsor boom, allowing concurrent overlapping."""
         self.is_charging = False
+        if not self.enabled:
+            return
         self.sfx_boom.play()
         
     def start_charge(self):
         """Starts the rising repulsor charge whine if not already playing."""
+        if not self.enabled:
+            return
         if not self.is_charging and not self.charge_channel.get_busy():
             self.charge_channel.play(self.sfx_charge)
             self.is_charging = True
 
     def stop_charge(self):
         """Stops the charge sound if the user lowers their hand without firing."""
+        if not self.enabled:
+            return
         if self.is_charging:
             self.charge_channel.fadeout(200) # Quick fade out instead of hard cut
             self.is_charging = False
 
     def cleanup(self):
-        pygame.mixer.quit()
+        if self.enabled:
+            self.mixer.quit()
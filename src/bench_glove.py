@@ -0,0 +1,180 @@
+"""
+Benchmark the exoskeleton glove against a pre-rendered sprite version.
+
+The glove is drawn from thick cv2 lines and filled circles. SpriteGlove below draws
+the same glove from a per-theme cache instead: the joint caps and every stroke's
+round ends are pre-rasterized disc sprites stamped with cv2.copyTo, and the stroke
+bodies are flat quads. Both draw the same synthetic hands into a Compositor region
+and the script reports the per-hand draw time for each at a few hand sizes, plus how
+many pixels the two disagree on.
+
+    python src/bench_glove.py --iterations 2000
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from armor_themes import THEMES
+from compositor import Compositor
+from weapons.exoskeleton import Exoskeleton, EXO_PADDING
+
+#an open right hand with a ~100 px palm, landmarks relative to the wrist
+HAND_SHAPE = np.array([
+    [0, 0], [-40, -20], [-60, -45], [-75, -70], [-85, -95],
+    [-35, -100], [-40, -140], [-42, -165], [-44, -185],
+    [-10, -105], [-10, -150], [-10, -178], [-10, -200],
+    [15, -100], [18, -140], [20, -165], [22, -185],
+    [38, -90], [45, -120], [50, -140], [54, -158]], dtype=np.float32)
+
+DEFAULT_SIZES = [0.5, 1.0, 2.0]
+
+class BenchHand:
+    """Just the HandRecord fields the glove reads."""
+
+    def __init__(self, points):
+        self.points = points.astype(np.int32)
+        mins = self.points.min(axis=0)
+        maxs = self.points.max(axis=0)
+        self.bbox = (int(mins[0]), int(mins[1]), int(maxs[0]), int(maxs[1]))
+
+def _disc_sprite(radius, color):
+    size = 2 * radius + 1
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(mask, (radius, radius), radius, 255, -1)
+    patch = np.empty((size, size, 3), dtype=np.uint8)
+    patch[:] = color
+    return patch, mask
+
+def _stamp(layer, sprite, center):
+    patch, mask = sprite
+    r = mask.shape[0] // 2
+    h, w = layer.shape[:2]
+    x, y = center
+    if r <= x < w - r and r <= y < h - r:
+        cv2.copyTo(patch, mask, layer[y - r:y + r + 1, x - r:x + r + 1])
+        return
+    x0, y0 = x - r, y - r
+    cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x0 + mask.shape[1], w), min(y0 + mask.shape[0], h)
+    if cx1 > cx0 and cy1 > cy0:
+        src = (slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0))
+        cv2.copyTo(patch[src], mask[src], layer[cy0:cy1, cx0:cx1])
+
+def _quads(p1, p2, half_width):
+    """Flat-ended stroke bodies: (S, 2) endpoints -> (S, 4, 2) int32 corners."""
+    d = (p2 - p1).astype(np.float32)
+    normal = np.stack((-d[:, 1], d[:, 0]), axis=1)
+    normal *= half_width / np.maximum(np.linalg.norm(d, axis=1, keepdims=True), 1e-6)
+    return np.rint(np.stack((p1 + normal, p2 + normal, p2 - normal, p1 - normal), axis=1)).astype(np.int32)
+
+class SpriteGlove:
+    """The glove drawn from a per-theme sprite cache, for comparison only."""
+
+    def __init__(self):
+        self.glove = Exoskeleton()
+        self.sprites = {theme["name"]: self._build(theme) for theme in THEMES.values()}
+
+    @staticmethod
+    def _build(theme):
+        return {
+            "joint": _disc_sprite(14, theme["exo_accent"]),
+            "palm_end": _disc_sprite(13, theme["exo_base"]),
+            "finger_end": _disc_sprite(11, theme["exo_base"]),
+            "edge_end": _disc_sprite(6, theme["exo_edge"]),
+        }
+
+    def draw(self, compositor, hand, theme):
+        sprites = self.sprites[theme["name"]]
+        base, edge, gold = theme["exo_base"], theme["exo_edge"], theme["exo_accent"]
+        x0, y0, x1, y1 = hand.bbox
+        region = compositor.region(x0 - EXO_PADDING, y0 - EXO_PADDING, x1 + EXO_PADDING + 1, y1 + EXO_PADDING + 1)
+        if region is None:
+            return
+        overlay, (x0, y0) = region
+        local = hand.points - np.array([x0, y0], dtype=np.int32)
+        points = [tuple(p) for p in local.tolist()]
+
+        palm = self.glove.palm_path
+        palm_pts = local[palm].reshape((-1, 1, 2))
+        cv2.fillPoly(overlay, [palm_pts], base)
+        for quad in _quads(local[palm], local[palm[1:] + palm[:1]], 13):
+            cv2.fillConvexPoly(overlay, quad, base)
+        for i in palm:
+            _stamp(overlay, sprites["palm_end"], points[i])
+        cv2.polylines(overlay, [palm_pts], True, gold, 4)
+
+        knuckles = [5, 9, 13, 17]
+        for quad, i in zip(_quads(local[[0] * 4], local[knuckles], 6), knuckles):
+            cv2.fillConvexPoly(overlay, quad, edge)
+            _stamp(overlay, sprites["edge_end"], points[i])
+            cv2.line(overlay, points[0], points[i], gold, 2)
+        _stamp(overlay, sprites["edge_end"], points[0])
+
+        starts = [i for path in self.glove.finger_paths for i in path[:-1]]
+        ends = [i for path in self.glove.finger_paths for i in path[1:]]
+        base_quads = _quads(local[starts], local[ends], 11)
+        edge_quads = _quads(local[starts], local[ends], 6)
+        k = 0
+        for path in self.glove.finger_paths:
+            for i in range(len(path) - 1):
+                cv2.fillConvexPoly(overlay, base_quads[k], base)
+                _stamp(overlay, sprites["finger_end"], points[path[i + 1]])
+                cv2.fillConvexPoly(overlay, edge_quads[k], edge)
+                _stamp(overlay, sprites["edge_end"], points[path[i + 1]])
+                _stamp(overlay, sprites["joint"], points[path[i]])
+                k += 1
+            _stamp(overlay, sprites["joint"], points[path[-1]])
+
+def render(draw, compositor, hand, theme):
+    """The layer pixels one draw produces, for checking both gloves look the same."""
+    compositor.layer[:] = 0  # the timing loops leave their strokes behind
+    draw(compositor, hand, theme=theme)
+    compositor.dirty = []
+    return compositor.layer.copy()
+
+def time_draw(draw, compositor, hand, theme, iterations):
+    """Best-of-5 microseconds per draw (drawing only, no blend)."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            draw(compositor, hand, theme=theme)
+            compositor.dirty = []
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Exoskeleton glove vs sprite cache benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--sizes", type=float, nargs="+", default=DEFAULT_SIZES,
+                        help="hand sizes relative to a ~100 px palm")
+    args = parser.parse_args()
+
+    theme = THEMES["mark_iii"]
+    glove = Exoskeleton()
+    sprite_glove = SpriteGlove()
+    compositor = Compositor()
+    compositor.begin((1080, 1920, 3))
+
+    print(f"{'size':>5} {'cv2 us':>8} {'sprite us':>10} {'ratio':>6} {'diff px':>8} {'glove px':>9}")
+    for size in args.sizes:
+        hand = BenchHand(HAND_SHAPE * size + (960, 700))
+        cv2_us = time_draw(glove.draw, compositor, hand, theme, args.iterations)
+        sprite_us = time_draw(sprite_glove.draw, compositor, hand, theme, args.iterations)
+        reference = render(glove.draw, compositor, hand, theme)
+        differing = np.count_nonzero(np.any(reference != render(sprite_glove.draw, compositor, hand, theme), axis=2))
+        covered = np.count_nonzero(reference.any(axis=2))
+        print(f"{size:>5.2f} {cv2_us:>8.1f} {sprite_us:>10.1f} {sprite_us / cv2_us:>6.2f} {differing:>8} {covered:>9}")
+
+    # Joint caps alone: the part sprites are usually expected to win
+    layer = compositor.layer[400:1000, 600:1300]
+    centers = [(50 + 25 * i, 60 + 20 * i) for i in range(20)]
+    cap = _disc_sprite(14, theme["exo_accent"])
+    for label, fn in (("cv2.circle", lambda: [cv2.circle(layer, c, 14, theme["exo_accent"], -1) for c in centers]),
+                      ("sprite stamp", lambda: [_stamp(layer, cap, c) for c in centers])):
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            fn()
+        print(f"20 joint caps, {label:<12} {(time.perf_counter() - start) / args.iterations * 1e6:>7.1f} us")
+
+if __name__ == "__main__":
+    main()
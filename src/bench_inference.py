@@ -0,0 +1,104 @@
+"""
+Benchmark hand inference cost vs accuracy at different inference scales.
+
+Runs the hand landmarker over the same frames at each scale (IMAGE mode, so every
+frame is a fresh detection and the numbers are comparable) and reports the per-frame
+cost of preparing the image (the tracker's downsize and mp.Image copy) and of inference,
+plus detection agreement and landmark error against the full-resolution run. Errors
+are in display pixels, the same units the effects use. Only the hand landmarker is
+built; pose runs every few frames at most and isn't part of the comparison.
+
+    python src/bench_inference.py --source clip.mp4 --frames 300
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from hand_tracker import HAND_MODEL, NUM_HANDS, make_mp_image
+from model_store import ModelStore
+from frame_source import open_frame_source
+
+DEFAULT_SCALES = [1.0, 0.75, 0.5, 0.35, 0.25]
+
+def hands_to_pixels(results, w, h):
+    """{handedness: (21, 2) array of display pixel coordinates}"""
+    hands = {}
+    for i, hand_landmarks in enumerate(results.hand_landmarks):
+        label = results.handedness[i][0].category_name
+        hands[label] = np.array([(lm.x * w, lm.y * h) for lm in hand_landmarks], dtype=np.float32)
+    return hands
+
+def create_hand_landmarker():
+    """IMAGE-mode hand landmarker with the tracker's detection settings."""
+    options = vision.HandLandmarkerOptions(
+        base_options=python.BaseOptions(model_asset_path=ModelStore().verified_path(HAND_MODEL)),
+        running_mode=vision.RunningMode.IMAGE,
+        num_hands=NUM_HANDS,
+        min_hand_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference scale benchmark")
+    parser.add_argument("--source", required=True, help="video file or image directory")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES)
+    args = parser.parse_args()
+
+    source = open_frame_source(args.source)
+    frames = []
+    while source.isOpened() and len(frames) < args.frames:
+        success, frame = source.read()
+        if success:
+            frames.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    source.release()
+    if not frames:
+        print("No frames read.")
+        return
+    h, w, _ = frames[0].shape
+    print(f"{len(frames)} frames at {w}x{h}")
+
+    # IMAGE mode keeps no state between calls, so one landmarker serves every scale
+    detector = create_hand_landmarker()
+    # Warm up so the first-call spike doesn't skew the timing
+    detector.detect(make_mp_image(frames[0], 1.0)[0])
+
+    reference = None
+    print(f"{'scale':>6} {'input':>11} {'prep ms':>8} {'infer ms':>9} {'detected':>9} {'agree':>6} {'mean px':>8} {'p95 px':>7}")
+    for scale in sorted(args.scales, reverse=True):
+        per_frame = []
+        buffer = None
+        prep = infer = 0.0
+        for frame_rgb in frames:
+            start = time.perf_counter()
+            mp_image, buffer = make_mp_image(frame_rgb, scale, buffer)
+            prepared = time.perf_counter()
+            results = detector.detect(mp_image)
+            prep += prepared - start
+            infer += time.perf_counter() - prepared
+            per_frame.append(hands_to_pixels(results, w, h))
+
+        if reference is None:
+            reference = per_frame
+
+        errors = []
+        agree = 0
+        for ref_hands, hands in zip(reference, per_frame):
+            if ref_hands.keys() == hands.keys():
+                agree += 1
+            for label in ref_hands.keys() & hands.keys():
+                errors.extend(np.linalg.norm(ref_hands[label] - hands[label], axis=1))
+
+        detected = sum(len(hands) for hands in per_frame)
+        mean_err = float(np.mean(errors)) if errors else float("nan")
+        p95_err = float(np.percentile(errors, 95)) if errors else float("nan")
+        size = f"{int(w * scale)}x{int(h * scale)}"
+        print(f"{scale:>6.2f} {size:>11} {prep / len(frames) * 1000:>8.2f} {infer / len(frames) * 1000:>9.2f} {detected:>9} "
+              f"{agree / len(frames) * 100:>5.0f}% {mean_err:>8.2f} {p95_err:>7.2f}")
+    detector.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Adaptive inference cadence.
+
+Decides per frame whether the tracker should run hand inference or extrapolate from
+the last real result. Inference is skipped only when it doesn't fit the frame budget,
+and hands that move fast get inferred more often than hands that are nearly still.
+"""
+import math
+
+#share of the frame interval hand inference may use before we start skipping frames
+INFERENCE_BUDGET_FRACTION = 0.6
+
+#never go more than this many frames without a real inference
+MAX_SKIP_FRAMES = 3
+
+#anchor speed (display px per frame) above which hands count as fast / below which as slow
+FAST_HAND_SPEED = 25.0
+SLOW_HAND_SPEED = 5.0
+
+#smoothing for the measured inference time and frame interval
+TIMING_ALPHA = 0.2
+
+class AdaptiveCadence:
+    def __init__(self, budget_fraction=INFERENCE_BUDGET_FRACTION, max_skip=MAX_SKIP_FRAMES):
+        self.budget_fraction = budget_fraction
+        self.max_skip = max_skip
+
+        self.inference_ms = None   # smoothed cost of one hand inference
+        self.frame_interval_ms = None  # smoothed time between frames
+        self._last_frame_ts = None
+        self.frames_since_inference = 0
+        self.inference_step = 1  # frames since the previous inference, including this one
+
+        # Stats
+        self.inferred = 0
+        self.skipped = 0
+
+    def observe_frame(self, timestamp_ms):
+        """Call once per frame with the frame timestamp, before should_infer()."""
+        if self._last_frame_ts is not None and timestamp_ms > self._last_frame_ts:
+            interval = timestamp_ms - self._last_frame_ts
+            if self.frame_interval_ms is None:
+                self.frame_interval_ms = interval
+            else:
+                self.frame_interval_ms += TIMING_ALPHA * (interval - self.frame_interval_ms)
+        self._last_frame_ts = timestamp_ms
+        self.frames_since_inference += 1
+
+    def record_inference(self, elapsed_ms):
+        if self.inference_ms is None:
+            self.inference_ms = elapsed_ms
+        else:
+            self.inference_ms += TIMING_ALPHA * (elapsed_ms - self.inference_ms)
+
+    def target_interval(self, hand_speed):
+        """How many frames apart inferences should be right now (1 = every frame)."""
+        if self.inference_ms is None or self.frame_interval_ms is None:
+            return 1
+        budget = self.frame_interval_ms * self.budget_fraction
+        interval = math.ceil(self.inference_ms / budget)
+        if interval <= 1:
+            # Inference fits the budget, never skip
+            return 1
+        if hand_speed > FAST_HAND_SPEED:
+            # Extrapolation error grows with speed, spend what we can on real results
+            interval -= 1
+        elif hand_speed < SLOW_HAND_SPEED:
+            interval += 1
+        return max(1, min(interval, self.max_skip + 1))
+
+    def should_infer(self, hand_speed, have_hands):
+        """hand_speed: fastest tracked hand (px/frame); have_hands: anything to extrapolate from."""
+        if not have_hands or self.frames_since_inference >= self.target_interval(hand_speed):
+            self.inference_step = self.frames_since_inference
+            self.frames_since_inference = 0
+            self.inferred += 1
+            return True
+        self.skipped += 1
+        return False
@@ -0,0 +1,231 @@
+import cv2
+import threading
+import time
+from camera_config import apply_camera_config, autotune
+
+# Supervisor states
+STATE_CONNECTING = "CONNECTING"
+STATE_LIVE = "LIVE"
+STATE_NO_SIGNAL = "NO SIGNAL"
+
+#most frames a flush drops (drivers typically queue 4, some more)
+FLUSH_MAX_FRAMES = 8
+
+#a grab that takes longer than this (seconds) waited for the sensor, so nothing was queued
+FLUSH_QUEUED_S = 0.008
+
+class CaptureSupervisor:
+    """Owns the cv2.VideoCapture and keeps it alive.
+
+    Failed reads back off exponentially instead of spinning, and after repeated
+    failures (or no frame for stall_timeout seconds) the device is released and
+    reopened. The state is LIVE while frames arrive and NO SIGNAL once stalled."""
+
+    def __init__(self, device=0, stall_timeout=2.0, backoff_initial=0.05, backoff_max=2.0,
+                 failures_before_reopen=5, open_fn=cv2.VideoCapture, config=None):
+        self.device = device
+        self.config = config
+        self.granted = None
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.failures_before_reopen = failures_before_reopen
+        self.open_fn = open_fn
+
+        self.state = STATE_CONNECTING
+        self.failures = 0
+        self.reopen_count = 0
+        self.backoff = backoff_initial
+        self.last_frame_time = time.monotonic()
+
+        self.cap = self._open()
+
+    def _open(self):
+        cap = self.open_fn(self.device)
+        # Re-apply the negotiated mode on every (re)open, a replugged camera comes back on defaults
+        if self.config is not None and cap.isOpened():
+            self.granted = apply_camera_config(cap, self.config)
+        return cap
+
+    def _reopen(self):
+        try:
+            self.cap.release()
+        except Exception:
+            pass
+        self.reopen_count += 1
+        self.cap = self._open()
+        self.failures = 0
+        print(f"Camera: reopening device {self.device} (attempt {self.reopen_count})")
+
+    def is_stalled(self):
+        return time.monotonic() - self.last_frame_time > self.stall_timeout
+
+    def read(self):
+        """One supervised read. Returns (success, frame); sleeps with backoff on failure."""
+        success, frame = False, None
+        if self.cap is not None and self.cap.isOpened():
+            success, frame = self.cap.read()
+
+        if success:
+            self.state = STATE_LIVE
+            self.failures = 0
+            self.backoff = self.backoff_initial
+            self.last_frame_time = time.monotonic()
+            return True, frame
+
+        self.failures += 1
+        if self.is_stalled():
+            self.state = STATE_NO_SIGNAL
+
+        # Wait before trying again, doubling up to backoff_max
+        time.sleep(self.backoff)
+        self.backoff = min(self.backoff * 2, self.backoff_max)
+
+        if self.failures >= self.failures_before_reopen or not self.cap.isOpened():
+            self._reopen()
+        return False, None
+
+    def flush(self, max_frames=FLUSH_MAX_FRAMES):
+        """Drops the frames the driver queued while nobody was reading, so the next read()
+        returns a current frame instead of one from before a throttled sleep. Returns the count."""
+        if self.cap is None or not self.cap.isOpened():
+            return 0
+        dropped = 0
+        for _ in range(max_frames):
+            start = time.monotonic()
+            if not self.cap.grab():
+                break
+            dropped += 1
+            if time.monotonic() - start > FLUSH_QUEUED_S:
+                break  # this one was freshly captured, the queue is empty
+        return dropped
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class ThreadedCapture:
+    """Reads a cv2.VideoCapture on a background thread into a single latest-frame slot.
+
+    The capture thread overwrites the slot on every new frame, so a slow main loop
+    always picks up the newest frame instead of draining a backlog of stale ones.
+    Frames that were overwritten before anyone read them are counted as dropped."""
+
+    def __init__(self, device=0, stall_timeout=2.0, config=None, tune=False):
+        self.device = device
+        if tune:
+            config, _ = autotune(device, base_config=config)
+        self.supervisor = CaptureSupervisor(device, stall_timeout=stall_timeout, config=config)
+
+        # The latest-frame slot (guarded by the condition's lock)
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._timestamp = 0.0
+        self._consumed_id = 0
+
+        # Stats
+        self.frames_captured = 0
+        self.dropped_frames = 0
+        self.last_timestamp = 0.0  # time.monotonic() at which the returned frame was captured
+
+        # Throttling: minimum seconds between captured frames (0 = as fast as the camera delivers).
+        # Frames that are never read are never decoded, which is most of the capture cost
+        self.frame_interval = 0.0
+        self._throttle = threading.Event()
+
+        self._running = False
+        self._thread = None
+
+    @property
+    def cap(self):
+        return self.supervisor.cap
+
+    def start(self):
+        """Start the capture thread. Returns self so it can be chained after the constructor."""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def set_frame_interval(self, seconds):
+        """Throttle capture to one frame every `seconds` (0 restores full rate immediately)."""
+        self.frame_interval = seconds
+        if seconds <= 0:
+            self._throttle.set()
+        else:
+            self._throttle.clear()
+
+    def _capture_loop(self):
+        while self._running:
+            if self.frame_interval > 0:
+                # Wakes early when the interval is cleared
+                remaining = self._timestamp + self.frame_interval - time.monotonic()
+                if remaining > 0:
+                    if self._throttle.wait(remaining):
+                        self._throttle.clear()
+                    # The driver kept queueing frames meanwhile; without this the first
+                    # frames after waking up (or every idle frame) would be stale
+                    self.supervisor.flush()
+
+            # The supervisor sleeps/reopens on failure, so this never busy-spins
+            success, frame = self.supervisor.read()
+            if not success:
+                continue
+
+            timestamp = time.monotonic()
+            with self._cond:
+                # Previous frame was never picked up by the main loop
+                if self._frame_id > self._consumed_id:
+                    self.dropped_frames += 1
+                self._frame = frame
+                self._frame_id += 1
+                self._timestamp = timestamp
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """Wait for a frame newer than the last one returned (like cap.read()).
+        Returns (success, frame). The capture time is available in self.last_timestamp."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frame_id > self._consumed_id or not self._running, timeout):
+                return False, None
+            if self._frame_id <= self._consumed_id:
+                return False, None
+            self._consumed_id = self._frame_id
+            self.last_timestamp = self._timestamp
+            # cap.read() allocates a fresh array each call, so handing out the reference is safe
+            return True, self._frame
+
+    @property
+    def state(self):
+        # A read blocked inside the driver never reports back, so check the clock too
+        if self.supervisor.is_stalled():
+            return STATE_NO_SIGNAL
+        return self.supervisor.state
+
+    def has_signal(self):
+        return self.state != STATE_NO_SIGNAL
+
+    def latency(self):
+        """Seconds elapsed since the last returned frame was captured."""
+        return time.monotonic() - self.last_timestamp
+
+    def isOpened(self):
+        # The supervisor keeps reopening the device, so we stay "open" until released
+        return self._running
+
+    def release(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.supervisor.release()
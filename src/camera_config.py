@@ -0,0 +1,104 @@
+import cv2
+import time
+
+# Candidate modes tried by autotune(), in order of preference
+AUTOTUNE_CANDIDATES = [
+    (1280, 720, 30),
+    (960, 540, 30),
+    (640, 480, 30),
+    (1280, 720, 15),
+]
+
+def fourcc_to_str(code):
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+class CameraConfig:
+    """Requested capture mode. Anything left as None keeps the driver default."""
+
+    def __init__(self, width=1280, height=720, fps=30, fourcc="MJPG", buffer_size=1):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+
+    def with_mode(self, width, height, fps):
+        return CameraConfig(width, height, fps, self.fourcc, self.buffer_size)
+
+    def __repr__(self):
+        return f"CameraConfig({self.width}x{self.height}@{self.fps} {self.fourcc}, buffer={self.buffer_size})"
+
+def apply_camera_config(cap, config):
+    """Request the config on an open capture and return what the driver actually granted:
+       {"width", "height", "fps", "fourcc", "buffer_size"}"""
+    # FOURCC has to go first, some drivers only offer high resolutions/frame rates in MJPG
+    if config.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+    if config.width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+    if config.height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    if config.fps:
+        cap.set(cv2.CAP_PROP_FPS, config.fps)
+    if config.buffer_size is not None:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+
+    granted = {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "fourcc": fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+
+    mismatches = []
+    if (config.width and granted["width"] != config.width) or (config.height and granted["height"] != config.height):
+        mismatches.append(f"size {granted['width']}x{granted['height']}")
+    if config.fps and abs(granted["fps"] - config.fps) > 0.5:
+        mismatches.append(f"fps {granted['fps']:.1f}")
+    if config.fourcc and granted["fourcc"] != config.fourcc:
+        mismatches.append(f"fourcc {granted['fourcc']!r}")
+    if mismatches:
+        print(f"Camera: requested {config}, driver granted {', '.join(mismatches)}")
+    return granted
+
+def measure_fps(cap, frames=30, warmup=5):
+    """Measure the frame rate the camera really delivers (drivers often lie about CAP_PROP_FPS)."""
+    for _ in range(warmup):
+        if not cap.read()[0]:
+            return 0.0
+    start = time.monotonic()
+    for _ in range(frames):
+        if not cap.read()[0]:
+            return 0.0
+    elapsed = time.monotonic() - start
+    return frames / elapsed if elapsed > 0 else 0.0
+
+def autotune(device=0, base_config=None, candidates=AUTOTUNE_CANDIDATES, frames=30, open_fn=cv2.VideoCapture):
+    """Try each candidate (width, height, fps) mode and return (best_config, results).
+
+    The first candidate (in preference order) that delivers at least 90% of its
+    requested frame rate wins; otherwise the one with the highest measured rate.
+    open_fn can be swapped for a fake capture backend."""
+    base_config = base_config or CameraConfig()
+    results = []
+    for width, height, fps in candidates:
+        config = base_config.with_mode(width, height, fps)
+        cap = open_fn(device)
+        try:
+            if not cap.isOpened():
+                continue
+            granted = apply_camera_config(cap, config)
+            measured = measure_fps(cap, frames=frames)
+        finally:
+            cap.release()
+        print(f"Camera autotune: {width}x{height}@{fps} -> {granted['width']}x{granted['height']} {measured:.1f} FPS")
+        results.append((config, granted, measured))
+        if measured >= 0.9 * fps:
+            return config, results
+
+    if not results:
+        return base_config, results
+    best = max(results, key=lambda r: r[2])
+    return best[0], results
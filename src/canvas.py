@@ -252,15 +252,12 @@ class ARCanvas:
                 active_lasers.append(laser)
         self.enemy_lasers = active_lasers
 
-    def process_interactions(self, frame, hand_landmarks, allow_drawing=True):
+    def process_interactions(self, frame, hand, allow_drawing=True):
         h, w, _ = frame.shape
-        index_tip = hand_landmarks[8]
-        thumb_tip = hand_landmarks[4]
+        # Index tip pixel position and pinch distance come precomputed in the HandRecord
+        ix, iy = hand.point_tuples[8]
         
-        ix, iy = int(index_tip.x * w), int(index_tip.y * h)
-        tx, ty = int(thumb_tip.x * w), int(thumb_tip.y * h)
-        
-        is_pinching = math.sqrt((ix - tx)**2 + (iy - ty)**2) < 40.0
+        is_pinching = hand.pinch_dist < 40.0
         
         # 1.5 CHECK COOLDOWN (Don't allow grabbing or drawing yet)
         if time.time() < self.cooldown_until:
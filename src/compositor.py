@@ -0,0 +1,78 @@
+"""
+Shared translucent overlay layer.
+
+Translucent renderers (the exoskeleton glove, and anything a theme adds later) don't
+blend into the frame themselves. They draw opaque colors into one persistent overlay
+layer through region(), which records a dirty rectangle. composite() then blends the
+layer onto the frame once, only inside the union of those rectangles, only where the
+layer has content (so black stays "nothing drawn"), and clears just those rectangles
+for the next frame. Two hands or five effects still cost one blend pass.
+"""
+import cv2
+import numpy as np
+
+#opacity of the overlay layer when blended onto the frame
+OVERLAY_ALPHA = 0.6
+
+def merge_rects(rects):
+    """Merges overlapping (x0, y0, x1, y1) rects until none overlap, so every pixel is blended once."""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            ax0, ay0, ax1, ay1 = rects[i]
+            for j in range(i + 1, len(rects)):
+                bx0, by0, bx1, by1 = rects[j]
+                if ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1:
+                    rects[i] = (min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1))
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+class Compositor:
+    def __init__(self, alpha=OVERLAY_ALPHA):
+        self.alpha = alpha
+
+        # Persistent full-frame buffers, (re)built when the frame size changes
+        self._shape = None
+        self.layer = None
+        self.coverage = None  # where the layer has content, rebuilt per dirty rect at composite time
+        self._blended = None
+        self.dirty = []
+
+    def begin(self, frame_shape):
+        """Call once per frame before any renderer asks for a region."""
+        if frame_shape != self._shape:
+            self._shape = frame_shape
+            self.layer = np.zeros(frame_shape, dtype=np.uint8)
+            self.coverage = np.zeros(frame_shape[:2], dtype=np.uint8)
+            self._blended = np.empty(frame_shape, dtype=np.uint8)
+            self.dirty = []
+
+    def region(self, x0, y0, x1, y1):
+        """Marks a rect dirty and returns (view of the layer, (x0, y0) origin) to draw into,
+        or None if the rect is entirely off-screen. Renderers shift their coordinates by the origin."""
+        h, w = self._shape[:2]
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, w), min(y1, h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        self.dirty.append((x0, y0, x1, y1))
+        return self.layer[y0:y1, x0:x1], (x0, y0)
+
+    def composite(self, frame):
+        """Blends everything drawn since begin() onto the frame, then clears the layer."""
+        for x0, y0, x1, y1 in merge_rects(self.dirty):
+            layer = self.layer[y0:y1, x0:x1]
+            roi = frame[y0:y1, x0:x1]
+            coverage = self.coverage[y0:y1, x0:x1]
+            blended = self._blended[y0:y1, x0:x1]
+            cv2.cvtColor(layer, cv2.COLOR_BGR2GRAY, dst=coverage)
+            cv2.addWeighted(layer, self.alpha, roi, 1.0 - self.alpha, 0, dst=blended)
+            np.copyto(roi, blended, where=(coverage > 0)[:, :, None])
+            layer[:] = 0
+        self.dirty = []
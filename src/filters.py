@@ -0,0 +1,194 @@
+"""
+Smoothing filters for tracked hands.
+
+Every filter works element-wise on a NumPy vector of any length, so smoothing all 21
+landmarks costs one vectorized update, about the same as smoothing the anchor alone.
+Each filter also keeps a velocity estimate so its output can be predicted forward to
+hide pipeline latency.
+
+    ema       fixed Exponential Moving Average (the original smoothing, lags on fast moves)
+    one_euro  One Euro filter: smooth when still, follows quickly when moving
+    kalman    constant-velocity Kalman filter per element
+"""
+import math
+import numpy as np
+
+#smoothing factor for Exponential Moving Average (EMA)
+#lower = smoother but more lag. Higher = faster but more jitter. (Range: 0.0 - 1.0)
+EMA_ALPHA = 0.5
+
+#One Euro tuning (values are in display pixels and seconds)
+#min_cutoff: jitter removal when still (lower = smoother). beta: how fast it catches up when moving
+ONE_EURO_MIN_CUTOFF = 1.5
+ONE_EURO_BETA = 0.01
+ONE_EURO_D_CUTOFF = 1.0
+
+#Kalman tuning: process noise (px^2/s^3, how much we expect velocity to change)
+#and measurement noise (px^2, landmark jitter)
+KALMAN_PROCESS_NOISE = 2000.0
+KALMAN_MEASUREMENT_NOISE = 9.0
+
+#a single gap longer than this resets velocity estimates instead of extrapolating across it
+MAX_DT = 0.5
+
+def _dt_seconds(t_ms, t_prev_ms):
+    return min(max((t_ms - t_prev_ms) / 1000.0, 1e-3), MAX_DT)
+
+class EMAFilter:
+    def __init__(self, alpha=EMA_ALPHA):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self._t_prev = None
+
+    def __call__(self, x, t_ms):
+        if self.value is None:
+            self.value = x.astype(np.float32)
+            self.velocity = np.zeros_like(self.value)
+        else:
+            dt = _dt_seconds(t_ms, self._t_prev)
+            new_value = self.alpha * x + (1 - self.alpha) * self.value
+            self.velocity = (new_value - self.value) / dt
+            self.value = new_value
+        self._t_prev = t_ms
+        return self.value
+
+    def predict(self, lead_ms):
+        return self.value + self.velocity * (lead_ms / 1000.0)
+
+class OneEuroFilter:
+    def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA, d_cutoff=ONE_EURO_D_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self._t_prev = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t_ms):
+        if self.value is None:
+            self.value = x.astype(np.float32)
+            self.velocity = np.zeros_like(self.value)
+            self._t_prev = t_ms
+            return self.value
+
+        dt = _dt_seconds(t_ms, self._t_prev)
+        # Smoothed derivative drives the cutoff: fast movement -> less smoothing -> less lag
+        raw_velocity = (x - self.value) / dt
+        a_d = self._alpha(dt, self.d_cutoff)
+        self.velocity = a_d * raw_velocity + (1 - a_d) * self.velocity
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        a = self._alpha(dt, cutoff)
+        self.value = a * x + (1 - a) * self.value
+        self._t_prev = t_ms
+        return self.value
+
+    def predict(self, lead_ms):
+        return self.value + self.velocity * (lead_ms / 1000.0)
+
+class ConstantVelocityKalman:
+    """Independent 1D constant-velocity Kalman filter for every element of the vector."""
+
+    def __init__(self, process_noise=KALMAN_PROCESS_NOISE, measurement_noise=KALMAN_MEASUREMENT_NOISE):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self._t_prev = None
+
+    def __call__(self, z, t_ms):
+        if self.value is None:
+            self.value = z.astype(np.float32)
+            self.velocity = np.zeros_like(self.value)
+            # Covariance [[p00, p01], [p01, p11]] per element
+            self.p00 = np.full_like(self.value, self.r)
+            self.p01 = np.zeros_like(self.value)
+            self.p11 = np.full_like(self.value, self.q)
+            self._t_prev = t_ms
+            return self.value
+
+        dt = _dt_seconds(t_ms, self._t_prev)
+        q = self.q
+
+        # Predict
+        self.value = self.value + self.velocity * dt
+        self.p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 3 / 3
+        self.p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        self.p11 = self.p11 + q * dt
+
+        # Update
+        s = self.p00 + self.r
+        k0 = self.p00 / s
+        k1 = self.p01 / s
+        residual = z - self.value
+        self.value = self.value + k0 * residual
+        self.velocity = self.velocity + k1 * residual
+        self.p11 = self.p11 - k1 * self.p01
+        self.p00 = (1 - k0) * self.p00
+        self.p01 = (1 - k0) * self.p01
+
+        self._t_prev = t_ms
+        return self.value
+
+    def predict(self, lead_ms):
+        return self.value + self.velocity * (lead_ms / 1000.0)
+
+FILTERS = {
+    "ema": EMAFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": ConstantVelocityKalman,
+}
+
+#spread in pixels that corresponds to scale 1.0 (see HologramTracker), used so the
+#scale is filtered in the same pixel units as everything else
+SCALE_PIXELS = 150.0
+
+class HandFilter:
+    """Filters one hand's anchor, scale and (optionally) all 21 landmarks as a single vector.
+
+    Everything is packed in display pixels: [anchor x, anchor y, scale * 150, landmark x/y/z...]"""
+
+    def __init__(self, kind="one_euro", filter_landmarks=False):
+        if kind not in FILTERS:
+            raise ValueError(f"Unknown filter {kind!r}, expected one of {list(FILTERS)}")
+        self.filter = FILTERS[kind]()
+        self.filter_landmarks = filter_landmarks
+        self.anchor = None  # last filtered (un-predicted) anchor and scale
+        self.scale = None
+
+    def update(self, anchor, scale, landmarks, t_ms, frame_size, lead_ms=0.0):
+        """Returns (anchor, scale, landmarks), predicted lead_ms ahead. landmarks is
+        returned untouched unless filter_landmarks is set."""
+        to_pixels = np.array((frame_size[0], frame_size[1], frame_size[0]), dtype=np.float32)
+        if self.filter_landmarks:
+            x = np.empty(3 + landmarks.size, dtype=np.float32)
+            x[3:] = (landmarks * to_pixels).ravel()
+        else:
+            x = np.empty(3, dtype=np.float32)
+        x[0], x[1], x[2] = anchor[0], anchor[1], scale * SCALE_PIXELS
+
+        filtered = self.filter(x, t_ms)
+        self.anchor = (int(filtered[0]), int(filtered[1]))
+        self.scale = float(filtered[2]) / SCALE_PIXELS
+
+        out = self.filter.predict(lead_ms) if lead_ms > 0 else filtered
+        out_anchor = (int(out[0]), int(out[1]))
+        out_scale = max(0.0, float(out[2]) / SCALE_PIXELS)
+        if self.filter_landmarks:
+            landmarks = (out[3:].reshape(landmarks.shape) / to_pixels).astype(np.float32)
+        return out_anchor, out_scale, landmarks
@@ -0,0 +1,141 @@
+import cv2
+import os
+import time
+from camera import ThreadedCapture
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+class FrameSource:
+    """Interface main() reads frames from. Mirrors the bits of cv2.VideoCapture we use.
+
+    read() returns (success, frame) and sets last_timestamp (seconds) for the returned
+    frame. is_live is False for recorded inputs, which can be processed as fast as possible."""
+
+    is_live = False
+
+    def __init__(self):
+        self.last_timestamp = 0.0
+        self.frames_captured = 0
+        self.dropped_frames = 0
+
+    def read(self, timeout=1.0):
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def has_signal(self):
+        return True
+
+    def set_frame_interval(self, seconds):
+        # Recorded input is never throttled
+        pass
+
+    def release(self):
+        pass
+
+class WebcamSource(ThreadedCapture):
+    """Live camera, read on its own thread (see camera.ThreadedCapture)."""
+
+    is_live = True
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, read sequentially. Timestamps are the media positions."""
+
+    def __init__(self, path, loop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self._finished = not self.cap.isOpened()
+        if self._finished:
+            print(f"Could not open video file: {path}")
+
+    def read(self, timeout=1.0):
+        if self._finished:
+            return False, None
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        if not success:
+            self._finished = True
+            return False, None
+        self.last_timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        self.frames_captured += 1
+        return True, frame
+
+    def isOpened(self):
+        return not self._finished
+
+    def release(self):
+        self._finished = True
+        self.cap.release()
+
+class ImageDirSource(FrameSource):
+    """Directory of still images, read in sorted filename order at a nominal frame rate."""
+
+    def __init__(self, directory, fps=30.0, loop=False):
+        super().__init__()
+        self.directory = directory
+        self.fps = fps
+        self.loop = loop
+        self.files = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.index = 0
+        if not self.files:
+            print(f"No images found in: {directory}")
+
+    def read(self, timeout=1.0):
+        # Bounded so a looping directory full of unreadable files can't spin forever
+        for _ in range(len(self.files)):
+            if self.index >= len(self.files):
+                break
+            path = self.files[self.index]
+            self.last_timestamp = self.frames_captured / self.fps
+            self.index += 1
+            if self.loop and self.index >= len(self.files):
+                self.index = 0
+            frame = cv2.imread(path)
+            if frame is None:
+                print(f"Skipping unreadable image: {path}")
+                continue
+            self.frames_captured += 1
+            return True, frame
+        return False, None
+
+    def isOpened(self):
+        return self.index < len(self.files)
+
+def is_live_spec(spec):
+    """True if the spec names a camera (known before anything is opened)."""
+    return str(spec).isdigit()
+
+def open_frame_source(spec, loop=False, camera_config=None, camera_tune=False):
+    """Open a frame source from a CLI-style spec: a camera index ("0"), a video file or an image directory."""
+    spec = str(spec)
+    if is_live_spec(spec):
+        return WebcamSource(int(spec), config=camera_config, tune=camera_tune).start()
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
+
+class FPSCounter:
+    """Counts processed frames and reports the average rate (used for headless benchmarking)."""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.frames = 0
+
+    def tick(self):
+        self.frames += 1
+
+    def fps(self):
+        elapsed = time.perf_counter() - self.start_time
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start_time
+        return f"{self.frames} frames in {elapsed:.2f}s ({self.fps():.1f} FPS)"
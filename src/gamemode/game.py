@@ -4,6 +4,7 @@ import math
 import random
 import numpy as np
 from canvas import Explosion
+from hud_text import draw_text
 
 class EnemyLaser:
     def __init__(self, start_x, start_y, target_x, target_y, speed=15):
@@ -289,7 +290,7 @@ class GameManager:
                 active_lasers.append(laser)
         canvas.enemy_lasers = active_lasers
 
-    def draw_hud_pillow(self, draw, title_font, frame_shape):
+    def draw_hud_pillow(self, frame, title_font):
         if self.game_mode:
             msg = f"SURVIVE: {self.time_left:.1f}s | SCORE: {self.score} | HULL: {self.player_health}%"
             
@@ -300,7 +301,7 @@ class GameManager:
             elif self.player_health > 20:
                 h_color = (255, 165, 0) # Orange
                 
-            draw.text((frame_shape[1] // 2 - 250, 40), msg, font=title_font, fill=h_color)
+            draw_text(frame, (frame.shape[1] // 2 - 250, 40), msg, title_font, h_color)
 
     def draw_hud_cv2(self, frame):
         if self.game_mode:
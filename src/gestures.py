@@ -0,0 +1,137 @@
+"""
+Batched hand pose classification.
+
+All hands in a frame are stacked into one (N, 21, 3) array and every wrist-to-joint
+distance is computed in a single NumPy pass. On top of that, GestureClassifier keeps
+a little state per hand so pose_type doesn't flicker:
+  - hands that have barely moved keep their previous pose without being re-classified,
+    unless a new pose is still waiting out its hold
+  - a new pose has to win POSE_HOLD_FRAMES frames in a row before it replaces the old one
+"""
+import numpy as np
+
+FINGER_TIPS = [8, 12, 16, 20]
+FINGER_PIPS = [6, 10, 14, 18]
+
+#largest landmark movement (normalized units) that still counts as "not moved"
+MOTION_THRESHOLD = 0.004
+
+#consecutive frames a different pose must be seen before we switch to it
+POSE_HOLD_FRAMES = 3
+
+def wrist_distances(landmarks):
+    """(N, 21, 3) -> (N, 21) 3D distance of every landmark from its hand's wrist."""
+    return np.linalg.norm(landmarks - landmarks[:, :1], axis=2)
+
+def palm_open_mask(dists):
+    """Open hand: at least 3 fingertips further from the wrist than their PIP joints."""
+    return np.count_nonzero(dists[:, FINGER_TIPS] > dists[:, FINGER_PIPS], axis=1) >= 3
+
+def thumbs_up_mask(landmarks, dists):
+    """Thumb extended and pointing up, with at least 3 fingers curled."""
+    thumb_extended = dists[:, 4] > dists[:, 3]
+    curled = np.count_nonzero(dists[:, FINGER_TIPS] < dists[:, FINGER_PIPS], axis=1) >= 3
+    thumb_pointing_up = landmarks[:, 4, 1] < landmarks[:, 3, 1]
+    return thumb_extended & curled & thumb_pointing_up
+
+def shield_mask(landmarks, is_left):
+    """Closed fist with knuckles pointed at the camera or the back of the hand facing it."""
+    wrist = landmarks[:, 0]
+    index_mcp = landmarks[:, 5]
+    pinky_mcp = landmarks[:, 17]
+
+    # Z depth to see if knuckles are pointed at the camera (-Z is closer to camera)
+    knuckles_forward = index_mcp[:, 2] < -0.015
+
+    # 2D orientation to see if back of hand faces camera
+    v1 = index_mcp[:, :2] - wrist[:, :2]
+    v2 = pinky_mcp[:, :2] - wrist[:, :2]
+    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    is_back_facing = np.where(is_left, cross < 0, cross > 0)
+    return is_back_facing | knuckles_forward
+
+def upright_masks(landmarks, is_left):
+    """(is_upright, palm_facing_camera). Upright means the wrist is at least 10% of the
+    screen below the middle finger base, like a stop sign."""
+    is_upright = landmarks[:, 0, 1] > landmarks[:, 9, 1] + 0.1
+    thumb_x = landmarks[:, 4, 0]
+    pinky_x = landmarks[:, 17, 0]
+    # Mirrored view: a right hand (labelled Left) has its thumb on the left of the screen
+    palm_facing_camera = np.where(is_left, thumb_x < pinky_x, thumb_x > pinky_x)
+    return is_upright, palm_facing_camera
+
+def classify_poses(landmarks, is_left):
+    """(N, 21, 3) landmarks + (N,) bool handedness -> list of N pose names."""
+    dists = wrist_distances(landmarks)
+    palm_open = palm_open_mask(dists)
+    shield = shield_mask(landmarks, is_left)
+    is_upright, palm_facing_camera = upright_masks(landmarks, is_left)
+
+    poses = np.full(len(landmarks), "NONE", dtype=object)
+    poses[~palm_open & shield] = "SHIELD"
+    # Repulsor works on both hands (open palm facing camera)
+    poses[palm_open & is_upright & palm_facing_camera] = "REPULSOR"
+    poses[palm_open & ~is_upright] = "DIAMOND"
+    return poses.tolist()
+
+class GestureClassifier:
+    def __init__(self, capacity=2, motion_threshold=MOTION_THRESHOLD, hold_frames=POSE_HOLD_FRAMES):
+        self.motion_threshold = motion_threshold
+        self.hold_frames = hold_frames
+        # Per-track state, indexed by track slot (see hand_tracks.TrackTable)
+        self.last_landmarks = np.zeros((capacity, 21, 3), dtype=np.float32)
+        self.stable_pose = np.full(capacity, None, dtype=object)  # None = no pose yet
+        self.candidate_pose = np.full(capacity, None, dtype=object)
+        self.candidate_count = np.zeros(capacity, dtype=np.int32)
+        self.reused = 0  # classifications skipped because the hand didn't move
+
+    def forget(self, slot):
+        self.stable_pose[slot] = None
+        self.candidate_pose[slot] = None
+        self.candidate_count[slot] = 0
+
+    def classify(self, hands, slots):
+        """hands: [(landmarks (21, 3), label), ...], slots: track slot per hand -> list of pose names."""
+        if not hands:
+            return []
+
+        stacked = np.stack([landmarks for landmarks, _ in hands])
+        slots = np.asarray(slots)
+
+        # Only re-classify hands that moved since their last classification, or that still have a
+        # pose waiting out the hold (otherwise a hand that stops moving mid-switch never switches)
+        known = np.array([pose is not None for pose in self.stable_pose[slots]])
+        movement = np.abs(stacked[:, :, :2] - self.last_landmarks[slots, :, :2]).max(axis=(1, 2))
+        moved = ~known | (movement >= self.motion_threshold) | (self.candidate_count[slots] > 0)
+
+        poses = self.stable_pose[slots].copy()
+        idx = np.flatnonzero(moved)
+        if len(idx):
+            is_left = np.array([hands[i][1] == "Left" for i in idx])
+            for i, pose in zip(idx, classify_poses(stacked[idx], is_left)):
+                self.last_landmarks[slots[i]] = stacked[i]
+                poses[i] = self._debounce(slots[i], pose)
+        self.reused += len(hands) - len(idx)
+        return poses.tolist()
+
+    def _debounce(self, slot, pose):
+        """Hysteresis: a new pose must be seen hold_frames times in a row before it sticks."""
+        stable = self.stable_pose[slot]
+        if stable is None or pose == stable:
+            self.stable_pose[slot] = pose
+            self.candidate_pose[slot] = None
+            self.candidate_count[slot] = 0
+            return pose
+
+        if self.candidate_pose[slot] == pose:
+            self.candidate_count[slot] += 1
+        else:
+            self.candidate_pose[slot] = pose
+            self.candidate_count[slot] = 1
+
+        if self.candidate_count[slot] >= self.hold_frames:
+            self.stable_pose[slot] = pose
+            self.candidate_pose[slot] = None
+            self.candidate_count[slot] = 0
+            return pose
+        return stable
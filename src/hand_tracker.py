@@ -1,209 +1,614 @@
+import cv2
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
-import urllib.request
-import os
 import math
+import numpy as np
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gestures import GestureClassifier
+from hand_tracks import TrackTable, hand_centers
+from cadence import AdaptiveCadence
+from filters import FILTERS, HandFilter
+from motion_gate import MotionGate
+from inference_cache import InferenceCache
+from model_store import ModelStore, MODEL_DIR
 
-MODEL_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "hand_landmarker.task")
-
-POSE_MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task"
-POSE_MODEL_PATH = os.path.join(os.path.dirname(__file__), "pose_landmarker_lite.task")
+HAND_MODEL = "hand_landmarker.task"
+POSE_MODEL = "pose_landmarker_lite.task"
 
 #constant float to control how high holograms float above the hand
 #increase this value to make shapes float higher
 HOLOGRAM_HOVER_MULTIPLIER = 1.5
 
-#smoothing factor for Exponential Moving Average (EMA)
-#lower = smoother but more lag. Higher = faster but more jitter. (Range: 0.0 - 1.0)
-EMA_ALPHA = 0.5
+#smoothing filter for anchor/scale (and optionally landmarks): "ema", "one_euro" or "kalman", see filters.py
+FILTER_KIND = "one_euro"
+
+# Running modes for the landmarkers
+#   "image":       synchronous detect() on every frame, palm detection runs every time
+#   "video":       synchronous detect_for_video() with frame timestamps, so MediaPipe can
+#                  track hands from the previous frame and skip palm detection
+#   "live_stream": detect_async() with a result callback, inference overlaps with rendering
+RUNNING_MODES = {
+    "image": vision.RunningMode.IMAGE,
+    "video": vision.RunningMode.VIDEO,
+    "live_stream": vision.RunningMode.LIVE_STREAM,
+}
+
+#a forward gap (ms) larger than this between frames is treated like a seek
+#and the landmarkers are recreated instead of "tracking" across the cut
+TIMESTAMP_JUMP_MS = 1000
+
+#pose inference only runs on every Nth frame (and only when something consumes it),
+#the chest position is interpolated in between
+POSE_INTERVAL = 4
+
+#frames are downsized by this factor before inference (1.0 = full resolution).
+#landmarks are normalized, so every pixel output stays in display coordinates.
+#see bench_inference.py for the accuracy/cost trade-off on your camera (and the README
+#for why only 0.5 or 0.25 are worth trying)
+INFERENCE_SCALE = 1.0
+
+#ROI mode: once hands are found, the next frame only searches a padded square around
+#each hand's last landmarks. padding is a fraction of the hand size on every side.
+#a full-frame search still runs every ROI_REDETECT_INTERVAL frames to pick up new hands
+ROI_PADDING = 0.35
+ROI_MIN_SIZE = 96
+ROI_REDETECT_INTERVAL = 15
+
+#skipped frames extrapolate at most this far past the last real inference
+MAX_EXTRAPOLATION_MS = 120
+
+#hands tracked at once (the app is tested with 2; MediaPipe handles up to 8 comfortably)
+NUM_HANDS = 2
+
+#two ROI crops whose palm centres are closer than this (normalized) found the same hand
+ROI_DUPLICATE_DISTANCE = 0.03
+
+KNUCKLES = [5, 9, 13, 17]
+
+class HandRecord:
+    """Everything the effects need about one tracked hand, computed once per frame.
+
+    landmarks: (21, 3) float32 normalized (x, y, z) from MediaPipe
+    points:    (21, 2) int32 display pixel coordinates
+    point_tuples: the same pixels as a list of (x, y) tuples, ready for cv2 calls
+    pinch_dist: pixel distance between thumb tip (4) and index tip (8)
+    bbox:      (x0, y0, x1, y1) pixel bounds of the landmarks
+    predicted: True when extrapolated on a frame that skipped inference (never firing)
+    track_id:  stable ID for this hand, never reused (handedness can flip, this doesn't)
+    slot:      index of the track's per-hand state arrays, 0..num_hands-1; reset your
+               slot state whenever the track_id in a slot changes"""
+
+    __slots__ = ("anchor", "scale", "pose_type", "is_firing", "speed", "handedness",
+                 "landmarks", "points", "point_tuples", "pinch_dist", "bbox", "predicted", "track_id", "slot")
+
+    def __init__(self, anchor, scale, pose_type, is_firing, speed, handedness, landmarks, points, predicted=False,
+                 track_id=-1, slot=-1):
+        self.predicted = predicted
+        self.track_id = track_id
+        self.slot = slot
+        self.anchor = anchor
+        self.scale = scale
+        self.pose_type = pose_type
+        self.is_firing = is_firing
+        self.speed = speed
+        self.handedness = handedness
+        self.landmarks = landmarks
+        self.points = points
+        self.point_tuples = [tuple(p) for p in points.tolist()]
+
+        tx, ty = self.point_tuples[4]
+        ix, iy = self.point_tuples[8]
+        self.pinch_dist = math.hypot(ix - tx, iy - ty)
+
+        mins = points.min(axis=0)
+        maxs = points.max(axis=0)
+        self.bbox = (int(mins[0]), int(mins[1]), int(maxs[0]), int(maxs[1]))
+
+class _HandMotion:
+    """Last real inference for one hand plus its velocities (per ms), for extrapolation."""
+    __slots__ = ("timestamp_ms", "record", "v_anchor", "v_scale", "v_landmarks")
+
+    def __init__(self, timestamp_ms, record, v_anchor, v_scale, v_landmarks):
+        self.timestamp_ms = timestamp_ms
+        self.record = record
+        self.v_anchor = v_anchor
+        self.v_scale = v_scale
+        self.v_landmarks = v_landmarks
+
+def landmarks_to_array(hand_landmarks):
+    """MediaPipe landmark list -> (21, 3) float32 array. The only per-landmark Python loop per hand."""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float32)
+
+def hands_from_result(results):
+    """HandLandmarkerResult -> [(landmarks (21, 3) array, handedness label), ...]"""
+    return [
+        (landmarks_to_array(hand_landmarks), results.handedness[i][0].category_name)
+        for i, hand_landmarks in enumerate(results.hand_landmarks)
+    ]
+
+def make_mp_image(frame_rgb, scale, buffer=None):
+    """Wraps the frame for MediaPipe, downsizing it into buffer first if scale < 1 (a new buffer
+    is made when the size changes). Returns (mp.Image, buffer); mp.Image copies the pixels,
+    so the buffer can be reused for the next frame right away."""
+    if scale >= 1.0:
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb), buffer
+    h, w, _ = frame_rgb.shape
+    iw, ih = max(1, int(w * scale)), max(1, int(h * scale))
+    if buffer is None or buffer.shape[:2] != (ih, iw):
+        buffer = np.empty((ih, iw, 3), dtype=np.uint8)
+    cv2.resize(frame_rgb, (iw, ih), dst=buffer, interpolation=cv2.INTER_AREA)
+    return mp.Image(image_format=mp.ImageFormat.SRGB, data=buffer), buffer
 
 class HologramTracker:
-    def __init__(self):
-        #download models if not present
-        if not os.path.exists(MODEL_PATH):
-            print("Downloading hand landmarker model...")
-            urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
-            print("Download complete.")
-
-        if not os.path.exists(POSE_MODEL_PATH):
-            print("Downloading pose landmarker model...")
-            urllib.request.urlretrieve(POSE_MODEL_URL, POSE_MODEL_PATH)
-            print("Download complete.")
-
-        # Initialize Hand Landmarker
-        hand_base_options = python.BaseOptions(model_asset_path=MODEL_PATH)
+    def __init__(self, running_mode="video", pose_interval=POSE_INTERVAL, inference_scale=INFERENCE_SCALE, roi_mode=False,
+                 adaptive_cadence=False, filter_kind=FILTER_KIND, filter_landmarks=False, motion_gate=False,
+                 num_hands=NUM_HANDS, cache_dir=None, model_dir=MODEL_DIR, offline=False):
+        if running_mode not in RUNNING_MODES:
+            raise ValueError(f"Unknown running mode {running_mode!r}, expected one of {list(RUNNING_MODES)}")
+        self.running_mode = running_mode
+        self.num_hands = num_hands
+        self.inference_scale = inference_scale
+        self._infer_buffer = None  # preallocated downsized frame, reused every frame
+
+        # Models are checksummed once here; MediaPipe then maps the verified files itself,
+        # so every tracker (and tracker process) shares one page-cached copy
+        self.model_store = ModelStore(model_dir, offline=offline)
+        self.hand_model_path = self.model_store.verified_path(HAND_MODEL)
+        self.pose_model_path = self.model_store.verified_path(POSE_MODEL)
+
+        # Latest completed async result (live_stream mode), written by the MediaPipe callback thread
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        self._latest_result_ts = -1
+        self._processed_result_ts = -1
+        self._cached_tracking = []
+        self.result_timestamp_ms = -1  # timestamp of the frame the last returned landmarks came from
+
+        # Last timestamp handed to each landmarker (they must be strictly increasing)
+        self._last_ts = {"hand": -1, "pose": -1}
+
+        # ROI tracking: crops are independent images, so they get their own single-hand IMAGE-mode landmarker
+        # (live_stream results arrive late and out of step with the frame, so ROI mode doesn't apply there)
+        self.roi_mode = roi_mode and running_mode != "live_stream"
+
+        # The landmarkers are independent, so they're built in parallel
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="model-load") as loader:
+            hand_future = loader.submit(self._create_hand_detector)
+            pose_future = loader.submit(self._create_pose_detector)
+            roi_future = loader.submit(self._create_roi_detector) if self.roi_mode else None
+            self.hand_detector = hand_future.result()
+            self.pose_detector = pose_future.result()
+            self.roi_detector = roi_future.result() if roi_future is not None else None
+        self._roi_boxes = []
+        self._frames_since_full = 0
+
+        # Pose inference runs here while hand inference runs on the caller's thread
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pose")
+
+        # Low-rate pose scheduling and chest interpolation
+        self.pose_interval = max(1, pose_interval)
+        self._frames_since_pose = self.pose_interval
+        self._chest_prev = None
+        self._chest_latest = None
+        
+        # Adaptive cadence: under load, skip inference on some frames and extrapolate instead
+        # (live_stream already decouples inference from the frame rate, so it doesn't apply there)
+        self.cadence = AdaptiveCadence() if adaptive_cadence and running_mode != "live_stream" else None
+        self._motion = [None] * num_hands  # _HandMotion per track slot
+        self._inference_step = 1  # frames covered by the current real inference
+
+        # Motion gate: with no hands last frame and a static scene, both landmarkers are skipped
+        self.motion_gate = MotionGate() if motion_gate else None
+        self._had_hands = False
+
+        # Landmark results cached on disk by frame content (recorded input only: live frames never repeat)
+        self.cache = None
+        if cache_dir is not None and running_mode != "live_stream":
+            options = {"running_mode": running_mode, "inference_scale": inference_scale,
+                       "roi_mode": self.roi_mode, "num_hands": num_hands}
+            model_digests = [self.model_store.digest(HAND_MODEL), self.model_store.digest(POSE_MODEL)]
+            self.cache = InferenceCache(cache_dir, model_digests, options)
+        self._frame_key = None
+
+        # Batched pose classification with motion gating and hysteresis
+        self.gestures = GestureClassifier(num_hands)
+
+        # Stable track IDs; all per-hand state below is indexed by track slot
+        self.tracks = TrackTable(num_hands)
+
+        # Smoothing filters (per hand). Outputs are predicted prediction_ms ahead, which the
+        # caller sets from its measured capture-to-display latency (0 = no prediction)
+        if filter_kind not in FILTERS:
+            raise ValueError(f"Unknown filter {filter_kind!r}, expected one of {list(FILTERS)}")
+        self.filter_kind = filter_kind
+        self.filter_landmarks = filter_landmarks
+        self.prediction_ms = 0.0
+        self._filters = [None] * num_hands
+
+    def _create_hand_detector(self):
+        hand_base_options = python.BaseOptions(model_asset_path=self.hand_model_path)
         hand_options = vision.HandLandmarkerOptions(
             base_options=hand_base_options,
-            num_hands=2,
+            running_mode=RUNNING_MODES[self.running_mode],
+            num_hands=self.num_hands,
+            min_hand_detection_confidence=0.7,
+            min_tracking_confidence=0.7,
+            result_callback=self._on_hand_result if self.running_mode == "live_stream" else None
+        )
+        return vision.HandLandmarker.create_from_options(hand_options)
+
+    def _create_roi_detector(self):
+        roi_base_options = python.BaseOptions(model_asset_path=self.hand_model_path)
+        roi_options = vision.HandLandmarkerOptions(
+            base_options=roi_base_options,
+            running_mode=vision.RunningMode.IMAGE,
+            num_hands=1,
             min_hand_detection_confidence=0.7,
             min_tracking_confidence=0.7
         )
-        self.hand_detector = vision.HandLandmarker.create_from_options(hand_options)
+        return vision.HandLandmarker.create_from_options(roi_options)
 
-        # Initialize Pose Landmarker
-        pose_base_options = python.BaseOptions(model_asset_path=POSE_MODEL_PATH)
+    def _create_pose_detector(self):
+        # Pose is always queried synchronously, so live_stream uses VIDEO mode for it
+        pose_mode = "image" if self.running_mode == "image" else "video"
+        pose_base_options = python.BaseOptions(model_asset_path=self.pose_model_path)
         pose_options = vision.PoseLandmarkerOptions(
             base_options=pose_base_options,
+            running_mode=RUNNING_MODES[pose_mode],
             min_pose_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
-        self.pose_detector = vision.PoseLandmarker.create_from_options(pose_options)
-        
-        # State for EMA smoothing (per hand)
-        self.prev_x = {"Left": None, "Right": None}
-        self.prev_y = {"Left": None, "Right": None}
-        self.prev_scale = {"Left": None, "Right": None}
-
-    def _is_thumbs_up(self, landmarks):
-        """Check if the hand is doing a thumbs-up: thumb extended, all 4 fingers curled."""
-        wrist = landmarks[0]
-        
-        # Check thumb is extended (tip further from wrist than IP joint)
-        thumb_tip_dist = math.sqrt((landmarks[4].x - wrist.x)**2 + (landmarks[4].y - wrist.y)**2 + (landmarks[4].z - wrist.z)**2)
-        thumb_ip_dist = math.sqrt((landmarks[3].x - wrist.x)**2 + (landmarks[3].y - wrist.y)**2 + (landmarks[3].z - wrist.z)**2)
-        thumb_extended = thumb_tip_dist > thumb_ip_dist
-        
-        # Check 4 fingers are curled
-        fingers = [(8, 6), (12, 10), (16, 14), (20, 18)]
-        curled = 0
-        for tip, pip in fingers:
-            dist_tip = math.sqrt((landmarks[tip].x - wrist.x)**2 + (landmarks[tip].y - wrist.y)**2 + (landmarks[tip].z - wrist.z)**2)
-            dist_pip = math.sqrt((landmarks[pip].x - wrist.x)**2 + (landmarks[pip].y - wrist.y)**2 + (landmarks[pip].z - wrist.z)**2)
-            if dist_tip < dist_pip:
-                curled += 1
-        
-        # Thumb must point upward (tip Y < IP Y in normalized coords)
-        thumb_pointing_up = landmarks[4].y < landmarks[3].y
-        
-        return thumb_extended and curled >= 3 and thumb_pointing_up
-
-    
-    def _is_palm_open(self, landmarks):
-        """Check if the hand is open by comparing 3D distance from wrist to fingertips vs PIP joints.
-        If a finger is curled into a fist, the tip is closer to the wrist than the PIP joint."""
-        fingers = [(8, 6), (12, 10), (16, 14), (20, 18)]
-        wrist = landmarks[0]
-        
-        extended = 0
-        for tip, pip in fingers:
-            # 3D distance from wrist to tip
-            dist_tip = math.sqrt((landmarks[tip].x - wrist.x)**2 + 
-                                 (landmarks[tip].y - wrist.y)**2 + 
-                                 (landmarks[tip].z - wrist.z)**2)
-            # 3D distance from wrist to PIP
-            dist_pip = math.sqrt((landmarks[pip].x - wrist.x)**2 + 
-                                 (landmarks[pip].y - wrist.y)**2 + 
-                                 (landmarks[pip].z - wrist.z)**2)
-            
-            # If the tip is further from the wrist than the PIP, it's extended
-            if dist_tip > dist_pip:
-                extended += 1
-                
-        return extended >= 3
-
-    def _is_hand_upright(self, landmarks, handedness):
-        """
-        Checks if the hand is pointing straight up.
-        Wrist (0) must be physically lower on the screen (higher Y value) 
-        than the Middle Finger Base (9).
-        """
-        wrist = landmarks[0]
-        middle_base = landmarks[9]
-        thumb = landmarks[4]
-        pinky = landmarks[17]
-        
-        # We add 0.1 (10% of the screen) as a strict buffer so it only
-        # triggers when the hand is completely vertical like a stop sign.
-        is_upright = wrist.y > middle_base.y + 0.1
+        return vision.PoseLandmarker.create_from_options(pose_options)
+
+    def _reset_hand_state(self):
+        for slot in range(self.num_hands):
+            self._forget_slot(slot)
+        self.tracks.reset()
+        self._roi_boxes = []
+
+    def _forget_slot(self, slot):
+        self._filters[slot] = None
+        self._motion[slot] = None
+        self.gestures.forget(slot)
 
-        if handedness == "Left":
-            # Mirrored Right Hand: Thumb must be on the left side of the screen
-            palm_facing_camera = thumb.x < pinky.x
+    def _next_timestamp_ms(self, detector, timestamp_ms=None):
+        """Returns the timestamp to hand to a landmarker. In video mode a backwards jump
+        (replay seek, looped file) or a big forward gap recreates that landmarker, since
+        MediaPipe rejects non-increasing timestamps and tracking across a cut is meaningless."""
+        last = self._last_ts[detector]
+        if timestamp_ms is None:
+            timestamp_ms = time.monotonic() * 1000
+        timestamp_ms = int(timestamp_ms)
+
+        # last == 0 is the warm-up frame (see warm_up), real frames may start anywhere after it
+        if self.running_mode == "video" and last > 0 and (timestamp_ms < last or timestamp_ms - last > TIMESTAMP_JUMP_MS):
+            if detector == "hand":
+                self.hand_detector.close()
+                self.hand_detector = self._create_hand_detector()
+                self._reset_hand_state()
+            else:
+                self.pose_detector.close()
+                self.pose_detector = self._create_pose_detector()
+            last = -1
+        elif timestamp_ms <= last:
+            # Duplicate timestamps (some backends report a coarse media clock), nudge forward
+            timestamp_ms = last + 1
+
+        self._last_ts[detector] = timestamp_ms
+        return timestamp_ms
+
+    def warm_up(self, shape=(720, 1280, 3), want_pose=True, timeout=2.0):
+        """Runs every landmarker once on a black frame, so the one-off graph setup cost
+        lands at startup instead of on the first camera frame. Uses timestamp 0."""
+        mp_image = self._make_mp_image(np.zeros(shape, dtype=np.uint8))
+        if self.running_mode == "live_stream":
+            self.hand_detector.detect_async(mp_image, 0)
+            # Wait for the callback so the spike is really over, then drop the dummy result
+            deadline = time.monotonic() + timeout
+            while self._latest_result_ts < 0 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            with self._result_lock:
+                self._latest_result = None
+                self._latest_result_ts = -1
+        elif self.running_mode == "video":
+            self.hand_detector.detect_for_video(mp_image, 0)
         else:
-            # Mirrored Left Hand: Thumb must be on the right side of the screen
-            palm_facing_camera = thumb.x > pinky.x
+            self.hand_detector.detect(mp_image)
+        self._last_ts["hand"] = 0
 
-        return is_upright, palm_facing_camera
+        if want_pose:
+            self._detect_pose(mp_image, 0)
+            self._last_ts["pose"] = 0
+        if self.roi_detector is not None:
+            crop = np.zeros((ROI_MIN_SIZE, ROI_MIN_SIZE, 3), dtype=np.uint8)
+            self.roi_detector.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=crop))
 
-    def get_anchor_point(self, frame_rgb):
-        """Returns a list of tracking data for each detected hand: 
-           [(anchor, scale_multiplier, pose_type, landmarks, is_firing, speed, handedness), ...]"""
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        results = self.hand_detector.detect(mp_image)
+    def _make_mp_image(self, frame_rgb):
+        """mp.Image for inference, downsized into the reusable buffer if inference_scale < 1."""
+        mp_image, self._infer_buffer = make_mp_image(frame_rgb, self.inference_scale, self._infer_buffer)
+        return mp_image
 
-        # Clear state for lost hands
-        detected_hands = []
-        if results.handedness:
-            detected_hands = [h[0].category_name for h in results.handedness]
-            
-        for h_label in ["Left", "Right"]:
-            if h_label not in detected_hands:
-                self.prev_x[h_label] = None
-                self.prev_y[h_label] = None
-                self.prev_scale[h_label] = None
+    def _on_hand_result(self, result, output_image, timestamp_ms):
+        """MediaPipe LIVE_STREAM callback (runs on MediaPipe's thread)."""
+        with self._result_lock:
+            self._latest_result = result
+            self._latest_result_ts = timestamp_ms
+
+    def get_anchor_point(self, frame_rgb, timestamp_ms=None):
+        """Returns a HandRecord for each detected hand (anchor, scale, pose_type, is_firing,
+           speed, handedness, plus the landmark arrays and derived pixel data).
 
-        if not results.hand_landmarks:
+           In live_stream mode the frame is queued for inference and the most recent
+           completed result is returned instead (its frame timestamp is in result_timestamp_ms)."""
+        # w/h are the display size, all pixel outputs are scaled by these and not the inference size
+        h, w, _ = frame_rgb.shape
+        hand_ts = self._next_timestamp_ms("hand", timestamp_ms)
+        if self._scene_idle(frame_rgb):
             return []
-        
-        tracking_list = []
+        self._frame_key = self.cache.frame_key(frame_rgb) if self.cache is not None else None
+        tracking_data = self._track_hands(frame_rgb, w, h, hand_ts)
+        self._had_hands = bool(tracking_data)
+        return tracking_data
+
+    def _scene_idle(self, frame_rgb):
+        """True when the motion gate says inference can be skipped for this frame.
+        The gate sees every frame so its background stays current, even while hands are tracked."""
+        if self.motion_gate is None:
+            return False
+        moving = self.motion_gate.has_motion(frame_rgb)
+        if moving or self._had_hands:
+            return False
+        self.motion_gate.gated += 1
+        return True
+
+    def process_frame(self, frame_rgb, timestamp_ms=None, want_pose=False):
+        """Runs hand inference and, when a consumer wants it, pose inference on one shared mp.Image.
+        Returns (tracking_data, chest_pos) like get_anchor_point() and get_pose_data().
+
+        Pose only runs every pose_interval frames while want_pose is set; chest_pos is
+        interpolated in between, and is None when pose isn't wanted. MediaPipe releases
+        the GIL while it infers, so pose runs on the worker while hands run here."""
+        # w/h are the display size, all pixel outputs are scaled by these and not the inference size
         h, w, _ = frame_rgb.shape
 
-        for i, hand_landmarks in enumerate(results.hand_landmarks):
-            handedness = results.handedness[i][0].category_name
-            
-            knuckles = [5, 9, 13, 17]
-            sum_x, sum_y = 0, 0
-            for idx in knuckles:
-                lm = hand_landmarks[idx]
-                sum_x += lm.x * w
-                sum_y += lm.y * h
-            
-            centroid_x = int(sum_x / 4)
-            centroid_y = int(sum_y / 4)
+        run_pose = want_pose and self._frames_since_pose >= self.pose_interval
+        if not want_pose:
+            # Nobody is looking at the chest, forget it and run as soon as someone does
+            self._chest_prev = self._chest_latest = None
+            self._frames_since_pose = self.pose_interval
 
-            thumb = hand_landmarks[4]
-            pinky = hand_landmarks[20]
-            thumb_x, thumb_y = thumb.x * w, thumb.y * h
-            pinky_x, pinky_y = pinky.x * w, pinky.y * h
+        # Timestamps are taken here, a jump may recreate a landmarker and that must not race a detect.
+        # Both clocks advance on every frame, including gated frames and frames that skip pose,
+        # so waking up or turning pose back on doesn't look like a seek
+        hand_ts = self._next_timestamp_ms("hand", timestamp_ms)
+        pose_ts = self._next_timestamp_ms("pose", hand_ts)
+        if self._scene_idle(frame_rgb):
+            # Nothing moved and nobody's hands are up: the last chest position still holds
+            return [], self._interpolated_chest()
+        self._frame_key = self.cache.frame_key(frame_rgb) if self.cache is not None else None
+        if not run_pose:
+            tracking_data = self._track_hands(frame_rgb, w, h, hand_ts)
+            self._had_hands = bool(tracking_data)
+            if want_pose:
+                self._frames_since_pose += 1
+            return tracking_data, self._interpolated_chest()
 
-            spread_pixels = math.sqrt((pinky_x - thumb_x)**2 + (pinky_y - thumb_y)**2)
-            scale_multiplier = spread_pixels / 150
+        shoulders = self.cache.get_pose(self._frame_key) if self._frame_key is not None else None
+        if shoulders is not None:
+            tracking_data = self._track_hands(frame_rgb, w, h, hand_ts)
+        else:
+            mp_image = self._make_mp_image(frame_rgb)
+            pose_future = self._pool.submit(self._detect_pose, mp_image, pose_ts)
+            try:
+                tracking_data = self._track_hands(frame_rgb, w, h, hand_ts, mp_image)
+            finally:
+                # Always join, the worker still holds the shared frame
+                pose_results = pose_future.result()
+            shoulders = self._shoulders_from_pose(pose_results)
+            if self._frame_key is not None:
+                self.cache.put_pose(self._frame_key, shoulders)
+        self._had_hands = bool(tracking_data)
 
-            pose_type = "NONE" 
-            
-            if not self._is_palm_open(hand_landmarks):
-                # Shield: closed fists facing camera or knuckles pointing to camera
-                wrist = hand_landmarks[0]
-                index_mcp = hand_landmarks[5]
-                pinky_mcp = hand_landmarks[17]
-                
-                # Z depth to see if knuckles are pointed at the camera (-Z is closer to camera)
-                knuckles_forward = index_mcp.z < -0.015
-                
-                # Check 2D orientation to see if back of hand faces camera
-                v1 = (index_mcp.x - wrist.x, index_mcp.y - wrist.y)
-                v2 = (pinky_mcp.x - wrist.x, pinky_mcp.y - wrist.y)
-                cross = v1[0] * v2[1] - v1[1] * v2[0]
-                is_back_facing = (cross < 0) if handedness == "Left" else (cross > 0)
-                
-                if is_back_facing or knuckles_forward:
-                    pose_type = "SHIELD"
+        chest = self._chest_from_shoulders(shoulders, w, h)
+        # Start the next glide from wherever the chest is currently drawn, so it never jumps
+        self._chest_prev = self._interpolated_chest() if chest is not None else None
+        self._chest_latest = chest
+        self._frames_since_pose = 1
+        return tracking_data, self._interpolated_chest()
+
+    def _interpolated_chest(self):
+        if self._chest_latest is None:
+            return None
+        if self._chest_prev is None:
+            return self._chest_latest
+        alpha = min(1.0, self._frames_since_pose / self.pose_interval)
+        px, py = self._chest_prev
+        lx, ly = self._chest_latest
+        return (int(px + (lx - px) * alpha), int(py + (ly - py) * alpha))
+
+    def _track_hands(self, frame_rgb, w, h, timestamp_ms, mp_image=None):
+        """Hand inference for one frame. mp_image is the shared full-frame wrapper if the
+        caller already made one; otherwise it's only built when a full-frame search runs."""
+        if self.running_mode == "live_stream":
+            if mp_image is None:
+                mp_image = self._make_mp_image(frame_rgb)
+            self.hand_detector.detect_async(mp_image, timestamp_ms)
+            with self._result_lock:
+                results = self._latest_result
+                results_ts = self._latest_result_ts
+            if results is None:
+                return []
+            # Only feed each inference result through the smoothing/thrust logic once
+            if results_ts == self._processed_result_ts:
+                return self._cached_tracking
+            self._processed_result_ts = results_ts
+            self.result_timestamp_ms = results_ts
+            self._cached_tracking = self._process_hands(hands_from_result(results), w, h)
+            return self._cached_tracking
+
+        if self.cadence is not None:
+            self.cadence.observe_frame(timestamp_ms)
+            motions = [m for m in self._motion if m is not None]
+            max_speed = max((m.record.speed for m in motions), default=0.0)
+            if not self.cadence.should_infer(max_speed, bool(motions)):
+                return self._extrapolate_hands(timestamp_ms, w, h)
+            self._inference_step = max(1, self.cadence.inference_step)
+        self.result_timestamp_ms = timestamp_ms
+        hands = self.cache.get_hands(self._frame_key) if self._frame_key is not None else None
+        if hands is None:
+            hands = self._infer_hands(frame_rgb, timestamp_ms, mp_image)
+            if self._frame_key is not None:
+                self.cache.put_hands(self._frame_key, hands)
+        if self.roi_mode:
+            self._update_roi_boxes(hands, w, h)
+        return self._process_hands(hands, w, h)
+
+    def _infer_hands(self, frame_rgb, timestamp_ms, mp_image=None):
+        """Runs the landmarkers (ROI crops or full frame) -> [(landmarks, handedness), ...]"""
+        start = time.perf_counter()
+        hands = self._detect_in_rois(frame_rgb) if self.roi_mode else None
+        if hands is None:
+            # Full-frame search: no hands yet, a hand was lost, or a periodic re-detect is due
+            if mp_image is None:
+                mp_image = self._make_mp_image(frame_rgb)
+            if self.running_mode == "video":
+                results = self.hand_detector.detect_for_video(mp_image, timestamp_ms)
             else:
-                    is_upright, palm_facing_camera = self._is_hand_upright(hand_landmarks, handedness)
-                    # Repulsor works on both hands (open palm facing camera)
-                    if is_upright and palm_facing_camera:
-                        pose_type = "REPULSOR"
-                    elif is_upright and not palm_facing_camera:
-                        pose_type = "NONE"
-                    else:
-                        pose_type = "DIAMOND"
+                results = self.hand_detector.detect(mp_image)
+            hands = hands_from_result(results)
+            self._frames_since_full = 0
+        if self.cadence is not None:
+            self.cadence.record_inference((time.perf_counter() - start) * 1000)
+        return hands
+
+    def _extrapolate_hands(self, timestamp_ms, w, h):
+        """HandRecords for a frame that skipped inference, predicted from each hand's last
+        real result and velocity. They never fire: thrust detection only sees real results."""
+        frame_size = np.array((w, h), dtype=np.float32)
+        records = []
+        for motion in self._motion:
+            if motion is None:
+                continue
+            last = motion.record
+            dt = min(timestamp_ms - motion.timestamp_ms, MAX_EXTRAPOLATION_MS)
+            landmarks = last.landmarks + motion.v_landmarks * dt
+            points = (landmarks[:, :2] * frame_size).astype(np.int32)
+            anchor = (int(last.anchor[0] + motion.v_anchor[0] * dt), int(last.anchor[1] + motion.v_anchor[1] * dt))
+            records.append(HandRecord(
+                anchor=anchor,
+                scale=last.scale + motion.v_scale * dt,
+                pose_type=last.pose_type,
+                is_firing=False,
+                speed=last.speed,
+                handedness=last.handedness,
+                landmarks=landmarks,
+                points=points,
+                predicted=True,
+                track_id=last.track_id,
+                slot=last.slot
+            ))
+        return records
+
+    def _update_motion(self, record):
+        """Remember a real result and the velocity since the previous one for extrapolation."""
+        ts = self.result_timestamp_ms
+        prev = self._motion[record.slot]
+        if prev is not None and ts > prev.timestamp_ms:
+            dt = ts - prev.timestamp_ms
+            v_anchor = ((record.anchor[0] - prev.record.anchor[0]) / dt, (record.anchor[1] - prev.record.anchor[1]) / dt)
+            v_scale = (record.scale - prev.record.scale) / dt
+            v_landmarks = (record.landmarks - prev.record.landmarks) / dt
+        else:
+            v_anchor, v_scale, v_landmarks = (0.0, 0.0), 0.0, np.zeros_like(record.landmarks)
+        self._motion[record.slot] = _HandMotion(ts, record, v_anchor, v_scale, v_landmarks)
+
+    def _update_roi_boxes(self, hands, w, h):
+        """Padded square pixel box around each hand's landmarks, clamped to the frame."""
+        self._roi_boxes = []
+        for landmarks, _ in hands:
+            min_x, min_y = landmarks[:, :2].min(axis=0) * (w, h)
+            max_x, max_y = landmarks[:, :2].max(axis=0) * (w, h)
+            size = max(max_x - min_x, max_y - min_y) * (1 + 2 * ROI_PADDING)
+            size = int(min(max(size, ROI_MIN_SIZE), w, h))
+            cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+            x0 = int(min(max(cx - size / 2, 0), w - size))
+            y0 = int(min(max(cy - size / 2, 0), h - size))
+            self._roi_boxes.append((x0, y0, x0 + size, y0 + size))
+
+    def _detect_in_rois(self, frame_rgb):
+        """Runs the single-hand landmarker on a crop around each known hand and maps the
+        landmarks back to full-frame coordinates. Returns None when a full-frame search is needed."""
+        if not self._roi_boxes or self._frames_since_full >= ROI_REDETECT_INTERVAL:
+            return None
+
+        h, w, _ = frame_rgb.shape
+        hands = []
+        for x0, y0, x1, y1 in self._roi_boxes:
+            crop = np.ascontiguousarray(frame_rgb[y0:y1, x0:x1])
+            results = self.roi_detector.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=crop))
+            if not results.hand_landmarks:
+                # Hand left its box, fall back to searching the whole frame
+                return None
+            # Crop-normalized -> frame-normalized (z shares x's scale)
+            cw, ch = x1 - x0, y1 - y0
+            landmarks = landmarks_to_array(results.hand_landmarks[0])
+            landmarks *= (cw / w, ch / h, cw / w)
+            landmarks[:, 0] += x0 / w
+            landmarks[:, 1] += y0 / h
+            hands.append((landmarks, results.handedness[0][0].category_name))
+
+        # Two boxes latched onto the same hand (labels can't tell: two people may both show a right hand)
+        if len(hands) > 1:
+            centers = hand_centers(hands)
+            dists = np.linalg.norm(centers[:, None] - centers[None, :], axis=2)
+            np.fill_diagonal(dists, np.inf)
+            if dists.min() < ROI_DUPLICATE_DISTANCE:
+                return None
+
+        self._frames_since_full += 1
+        return hands
+
+    def _process_hands(self, hands, w, h):
+        """Turns [(landmarks, handedness), ...] into one HandRecord per hand (see get_anchor_point)."""
+        # Match detections to tracks; new and ended tracks start from clean state
+        slots, started, retired = self.tracks.update(hands)
+        for slot in started + retired:
+            self._forget_slot(slot)
+        # Hands over capacity have no slot to keep state in
+        if -1 in slots:
+            hands = [hand for hand, slot in zip(hands, slots) if slot >= 0]
+            slots = [slot for slot in slots if slot >= 0]
+        # Only hands seen in this result are extrapolated
+        for slot in range(self.num_hands):
+            if slot not in slots:
+                self._motion[slot] = None
+
+        # All hands are classified together in one NumPy pass
+        pose_types = self.gestures.classify(hands, slots)
+
+        if not hands:
+            return []
+        
+        tracking_list = []
+        frame_size = np.array((w, h), dtype=np.float32)
+
+        for (landmarks, handedness), pose_type, slot in zip(hands, pose_types, slots):
+            # Pixel coordinates for every landmark in one go
+            pixels = landmarks[:, :2] * frame_size
+            points = pixels.astype(np.int32)
+
+            centroid_x, centroid_y = pixels[KNUCKLES].mean(axis=0).astype(int).tolist()
+
+            # Thumb tip to pinky tip spread
+            spread_pixels = float(np.linalg.norm(pixels[20] - pixels[4]))
+            scale_multiplier = spread_pixels / 150
 
             # --- THE ANCHOR TARGETS ---
             if pose_type == "REPULSOR":
-                wrist = hand_landmarks[0]
-                wrist_x, wrist_y = wrist.x * w, wrist.y * h
+                wrist_x, wrist_y = pixels[0]
                 target_x = int(centroid_x * 0.7 + wrist_x * 0.3)
                 target_y = int(centroid_y * 0.7 + wrist_y * 0.3)
             elif pose_type == "DIAMOND":
@@ -218,62 +623,90 @@ class HologramTracker:
                 target_x = centroid_x
                 target_y = centroid_y
 
-            # Apply Exponential Moving Average (EMA) for smoothing
             is_firing = False
             speed = 0.0
-            
-            if self.prev_x[handedness] is None:
-                self.prev_x[handedness] = target_x
-                self.prev_y[handedness] = target_y
-                self.prev_scale[handedness] = scale_multiplier
-            else:
-                dx = target_x - self.prev_x[handedness]
-                dy = target_y - self.prev_y[handedness]
-                speed = math.sqrt(dx**2 + dy**2)
-                d_scale = scale_multiplier - self.prev_scale[handedness]
+
+            hand_filter = self._filters[slot]
+            if hand_filter is None:
+                hand_filter = self._filters[slot] = HandFilter(self.filter_kind, self.filter_landmarks)
+            elif hand_filter.anchor is not None:
+                # Thrust is judged against the last smoothed position, before prediction
+                dx = target_x - hand_filter.anchor[0]
+                dy = target_y - hand_filter.anchor[1]
+                # Per-frame rates, so skipped frames don't look like a thrust
+                speed = math.sqrt(dx**2 + dy**2) / self._inference_step
+                d_scale = (scale_multiplier - hand_filter.scale) / self._inference_step
                 
                 if pose_type == "REPULSOR":
                     if d_scale > 0.15:
                         is_firing = "CAMERA"
                     elif speed > 50:
                         is_firing = "TARGET"
-                
-                self.prev_x[handedness] = int(EMA_ALPHA * target_x + (1 - EMA_ALPHA) * self.prev_x[handedness])
-                self.prev_y[handedness] = int(EMA_ALPHA * target_y + (1 - EMA_ALPHA) * self.prev_y[handedness])
-                self.prev_scale[handedness] = EMA_ALPHA * scale_multiplier + (1 - EMA_ALPHA) * self.prev_scale[handedness]
+
+            anchor, scale, smoothed = hand_filter.update(
+                (target_x, target_y), scale_multiplier, landmarks,
+                self.result_timestamp_ms, (w, h), self.prediction_ms
+            )
+            if self.filter_landmarks:
+                # Effects draw from the smoothed landmarks, poses were classified on the raw ones
+                landmarks = smoothed
+                points = (landmarks[:, :2] * frame_size).astype(np.int32)
             
-            tracking_list.append(
-                ((self.prev_x[handedness], self.prev_y[handedness]), 
-                 self.prev_scale[handedness], 
-                 pose_type, 
-                 hand_landmarks, 
-                 is_firing, 
-                 speed, 
-                 handedness)
+            record = HandRecord(
+                anchor=anchor,
+                scale=scale,
+                pose_type=pose_type,
+                is_firing=is_firing,
+                speed=speed,
+                handedness=handedness,
+                landmarks=landmarks,
+                points=points,
+                track_id=int(self.tracks.track_ids[slot]),
+                slot=slot
             )
+            if self.cadence is not None:
+                self._update_motion(record)
+            tracking_list.append(record)
             
         return tracking_list
 
-    def get_pose_data(self, frame_rgb):
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.hand_detector.close()
+        if self.roi_detector is not None:
+            self.roi_detector.close()
+        self.pose_detector.close()
+
+    def get_pose_data(self, frame_rgb, timestamp_ms=None):
         """Returns the approximate chest position based on shoulder landmarks."""
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        results = self.pose_detector.detect(mp_image)
-        
-        if not results.pose_landmarks:
-            return None
-            
+        mp_image = self._make_mp_image(frame_rgb)
         h, w, _ = frame_rgb.shape
+        results = self._detect_pose(mp_image, self._next_timestamp_ms("pose", timestamp_ms))
+        return self._chest_from_shoulders(self._shoulders_from_pose(results), w, h)
+
+    def _detect_pose(self, mp_image, timestamp_ms):
+        if self.running_mode == "image":
+            return self.pose_detector.detect(mp_image)
+        return self.pose_detector.detect_for_video(mp_image, timestamp_ms)
+
+    def _shoulders_from_pose(self, results):
+        """(2, 2) normalized (x, y) of the left and right shoulder, or (0, 2) if nobody was found."""
+        if not results.pose_landmarks:
+            return np.empty((0, 2), dtype=np.float32)
+
         # Landmark 11: Left Shoulder, 12: Right Shoulder
         pose_landmarks = results.pose_landmarks[0]
-        l_shoulder = pose_landmarks[11]
-        r_shoulder = pose_landmarks[12]
+        return np.array([(pose_landmarks[i].x, pose_landmarks[i].y) for i in (11, 12)], dtype=np.float32)
+
+    def _chest_from_shoulders(self, shoulders, w, h):
+        if len(shoulders) == 0:
+            return None
         
         # Calculate midpoint
-        mid_x = (l_shoulder.x + r_shoulder.x) / 2
-        mid_y = (l_shoulder.y + r_shoulder.y) / 2
+        mid_x, mid_y = shoulders.mean(axis=0).tolist()
         
         # Offset down slightly to reach the center of the chest
         chest_x = int(mid_x * w)
         chest_y = int((mid_y + 0.15) * h) # 15% of height downward shift
         
-        return (chest_x, chest_y)
\ No newline at end of file
+        return (chest_x, chest_y)
@@ -0,0 +1,97 @@
+"""
+Stable track IDs for detected hands.
+
+MediaPipe returns hands in no particular order and its handedness label flips now and
+then, so per-hand state keyed by "Left"/"Right" breaks as soon as two people (or one
+misclassified hand) are in view. TrackTable matches each frame's detections to the
+previous frame's tracks by nearest neighbour and hands out:
+  - a track ID that never gets reused, for telling one hand from the next
+  - a slot (0..capacity-1) that indexes fixed-size per-track state arrays
+
+All per-track state here lives in arrays indexed by slot, consumers do the same and
+reset a slot's state when the track ID in it changes.
+"""
+import numpy as np
+
+#largest normalized distance a hand can move between two results and keep its track
+MAX_MATCH_DISTANCE = 0.15
+
+#unmatched tracks survive this many results before their slot is freed,
+#so a single missed detection doesn't cost the hand its state
+TRACK_GRACE_FRAMES = 2
+
+def hand_centers(hands):
+    """[(landmarks (21, 3), label), ...] -> (N, 2) normalized palm centres (wrist + knuckles)."""
+    if not hands:
+        return np.empty((0, 2), dtype=np.float32)
+    stacked = np.stack([landmarks[[0, 5, 9, 13, 17], :2] for landmarks, _ in hands])
+    return stacked.mean(axis=1)
+
+class TrackTable:
+    def __init__(self, capacity=2, max_distance=MAX_MATCH_DISTANCE, grace_frames=TRACK_GRACE_FRAMES):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.grace_frames = grace_frames
+
+        # Per-slot state
+        self.track_ids = np.full(capacity, -1, dtype=np.int64)  # -1 = free slot
+        self.centers = np.zeros((capacity, 2), dtype=np.float32)
+        self.missed = np.zeros(capacity, dtype=np.int32)  # consecutive results without a match
+        self._next_id = 0
+
+    @property
+    def active(self):
+        return self.track_ids >= 0
+
+    def reset(self):
+        self.track_ids[:] = -1
+        self.missed[:] = 0
+
+    def update(self, hands):
+        """Matches this result's hands to tracks. Returns (slots, started, retired): the slot
+        for every hand in order (-1 if over capacity), slots that got a new track on this
+        call (their old state must be reset), and slots whose track ended."""
+        centers = hand_centers(hands)
+        n = len(centers)
+        slots = np.full(n, -1, dtype=np.int64)
+
+        active = np.flatnonzero(self.active)
+        if n and len(active):
+            # Greedy nearest neighbour on the (tracks x detections) distance matrix, closest pairs first
+            dists = np.linalg.norm(self.centers[active, None, :] - centers[None, :, :], axis=2)
+            order = np.argsort(dists, axis=None)
+            used_tracks = np.zeros(len(active), dtype=bool)
+            for flat in order:
+                ti, di = divmod(int(flat), n)
+                if dists[ti, di] > self.max_distance:
+                    break
+                if used_tracks[ti] or slots[di] >= 0:
+                    continue
+                used_tracks[ti] = True
+                slots[di] = active[ti]
+
+        # Unmatched detections start new tracks: free slots first, then ones only kept for their grace period
+        matched = np.zeros(self.capacity, dtype=bool)
+        matched[slots[slots >= 0]] = True
+        waiting = np.flatnonzero(self.active & ~matched)
+        candidates = list(np.flatnonzero(~self.active)) + list(waiting[np.argsort(-self.missed[waiting], kind="stable")])
+        started = []
+        for di in np.flatnonzero(slots < 0):
+            if not candidates:
+                break  # more hands than capacity, the extras are dropped
+            slot = candidates.pop(0)
+            self.track_ids[slot] = self._next_id
+            self._next_id += 1
+            matched[slot] = True
+            slots[di] = slot
+            started.append(int(slot))
+
+        found = slots >= 0
+        self.centers[slots[found]] = centers[found]
+        self.missed[matched] = 0
+        self.missed[~matched & self.active] += 1
+
+        retired = np.flatnonzero(self.active & (self.missed > self.grace_frames))
+        self.track_ids[retired] = -1
+        self.missed[retired] = 0
+        return slots.tolist(), started, retired.tolist()
@@ -0,0 +1,49 @@
+"""
+Pillow text straight onto BGR frames.
+
+Converting the whole frame to a PIL image and back just to draw a few lines of text
+costs two full-frame color conversions and two copies. Instead each string is
+rasterized once into small blend weights (cached, since HUD strings rarely change)
+and alpha-blended into the frame only inside its own bounding box.
+"""
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+#rendered strings kept around; HUD text mostly repeats frame to frame
+MAX_CACHED_TEXTS = 256
+
+_texts = {}
+
+def _render(text, font, fill):
+    """(dx, dy, background weights, text weights, solid BGR patch) for text drawn at (0, 0)
+    the way ImageDraw.text places it: the patch's top-left corner sits at (dx, dy)."""
+    left, top, right, bottom = font.getbbox(text)
+    image = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(image).text((-left, -top), text, font=font, fill=255)
+    text_weights = np.asarray(image, dtype=np.float32) * (1.0 / 255)
+    solid = np.empty(text_weights.shape + (3,), dtype=np.uint8)
+    solid[:] = fill[::-1]
+    return left, top, 1.0 - text_weights, text_weights, solid
+
+def draw_text(frame, xy, text, font, fill):
+    """Draws text like ImageDraw.text((x, y), text, font=font, fill=fill) would on the RGB
+    version of frame. fill is RGB, as for Pillow; frame is BGR and is drawn on in place."""
+    key = (text, id(font), tuple(fill))
+    cached = _texts.get(key)
+    if cached is None:
+        if len(_texts) >= MAX_CACHED_TEXTS:
+            _texts.clear()
+        cached = _texts[key] = _render(text, font, fill)
+    dx, dy, bg_weights, text_weights, solid = cached
+
+    h, w = frame.shape[:2]
+    x0, y0 = xy[0] + dx, xy[1] + dy
+    x1, y1 = x0 + solid.shape[1], y0 + solid.shape[0]
+    cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, w), min(y1, h)
+    if cx1 <= cx0 or cy1 <= cy0:
+        return
+
+    roi = frame[cy0:cy1, cx0:cx1]
+    src = (slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0))
+    cv2.blendLinear(roi, solid[src], bg_weights[src], text_weights[src], dst=roi)
@@ -1,20 +1,29 @@
+import argparse
 import cv2
 import time
 import math
 import random
 import os
 import numpy as np
-from PIL import Image, ImageFont, ImageDraw
-from hand_tracker import HologramTracker
+from PIL import ImageFont
+from concurrent.futures import ThreadPoolExecutor
+from filters import FILTERS
 from diamond import HologramDiamond
 from weapons.repulsor import Repulsor
 from weapons.exoskeleton import Exoskeleton
 from weapons.shield import EnergyShield
+from weapons.arc_reactor import ArcReactor
+from compositor import Compositor
 from canvas import ARCanvas, Explosion, RepulsorBlast
 from audio_manager import AudioManager
 from gamemode.game import GameManager, Drone
 from scaling import process_scaling
 from armor_themes import ThemeManager
+from frame_source import open_frame_source, is_live_spec, FPSCounter
+from camera_config import CameraConfig
+from power import IdleMonitor, IDLE_AFTER_S
+from startup import StartupTimer
+from hud_text import draw_text
 
 def draw_target_brackets(frame, center, size=30, color=(255, 255, 0), thickness=2):
     x, y = center
@@ -32,33 +41,178 @@ def draw_target_brackets(frame, center, size=30, color=(255, 255, 0), thickness=
     cv2.line(frame, (x + l, y + l), (x + l - l//2, y + l), color, thickness)
     cv2.line(frame, (x + l, y + l), (x + l, y + l - l//2), color, thickness)
 
-def main():
-    cap = cv2.VideoCapture(0)
-    tracker = HologramTracker()
-    diamond = HologramDiamond(size=50)
-    repulsor = Repulsor(base_radius=50)
-    glove = Exoskeleton()
-    shield = EnergyShield()
-    canvas = ARCanvas()
-    audio = AudioManager()
-    theme_mgr = ThemeManager()
-
-    try:
-        hud_font = ImageFont.truetype("assets/fonts/Orbitron.ttf", 30)
-        title_font = ImageFont.truetype("assets/fonts/Orbitron.ttf", 40)
-    except IOError:
-        print("Font not found, using default OpenCV font")
-        hud_font = None
-        title_font = None
+# Capture mode requested from the webcam (MJPG avoids raw YUYV capping the frame rate)
+CAMERA_CONFIG = CameraConfig(width=1280, height=720, fps=30, fourcc="MJPG", buffer_size=1)
+# Set to True to probe candidate modes at startup and keep the fastest one that really delivers
+CAMERA_AUTOTUNE = False
+# Cap on how far ahead hands are predicted, past this extrapolation overshoots more than lag hurts
+MAX_PREDICTION_MS = 150.0
+
+# Cached "NO SIGNAL" screens keyed by frame shape, so a dead camera costs nothing to show
+_no_signal_frames = {}
+
+def get_no_signal_frame(shape):
+    if shape not in _no_signal_frames:
+        h, w = shape[:2]
+        screen = np.zeros(shape, dtype=np.uint8)
+        text = "NO SIGNAL"
+        text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 4)[0]
+        tx = (w - text_size[0]) // 2
+        ty = (h + text_size[1]) // 2
+        cv2.putText(screen, text, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (0, 0, 255), 4, cv2.LINE_AA)
+        cv2.putText(screen, "Reconnecting camera...", (tx, ty + 50), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 100, 0), 2, cv2.LINE_AA)
+        _no_signal_frames[shape] = screen
+    return _no_signal_frames[shape]
+
+def draw_hud(frame, hud_font, title_font, status_lines, theme_mgr, game):
+    """Draws the HUD text onto the frame in place. status_lines: [(label, status, BGR color), ...]."""
+    if hud_font and title_font:
+        # Pillow text is blended into each line's own box (see hud_text.py), colors are RGB
+        draw_text(frame, (30, 40), "HOLOGRAM AR SYSTEM", title_font, (0, 255, 255))
+        for i, (label, status, color) in enumerate(status_lines):
+            draw_text(frame, (30, 100 + 48 * i), f"{label}{status}", hud_font, color[::-1])
+        draw_text(frame, (30, 388), f"ARMOR    SYS:   {theme_mgr.get_name()}", hud_font, theme_mgr.get()['hud_accent'])
+        
+        # --- MISSION HUD OVERLAY ---
+        game.draw_hud_pillow(frame, title_font)
+        return
+
+    cv2.putText(frame, "HOLOGRAM AR SYSTEM", (30, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (255, 255, 0), 2, cv2.LINE_AA)
+    for i, (label, status, color) in enumerate(status_lines):
+        cv2.putText(frame, f"{label}{status}", (30, 110 + 48 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2, cv2.LINE_AA)
+    cv2.putText(frame, f"ARMOR    SYS:   {theme_mgr.get_name()}", (30, 398), cv2.FONT_HERSHEY_SIMPLEX, 1.0, theme_mgr.get()['hud_accent'], 2, cv2.LINE_AA)
+    
+    # --- MISSION HUD OVERLAY ---
+    game.draw_hud_cv2(frame)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AR Interactive Hologram")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file or image directory (default: camera 0)")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, no audio, no keyboard: process frames as fast as possible and report FPS")
+    parser.add_argument("--loop", action="store_true", help="loop file sources")
+    parser.add_argument("--tracker-mode", choices=["image", "video", "live_stream"], default=None,
+                        help="hand landmarker running mode (default: live_stream for cameras, video for files or with --roi/--adaptive-cadence)")
+    # Tracker option defaults live in hand_tracker.py, which isn't imported until the models load
+    parser.add_argument("--inference-scale", type=float, default=None,
+                        help="downsize frames by this factor before hand/pose inference (e.g. 0.5 for 1080p cameras)")
+    parser.add_argument("--roi", action="store_true",
+                        help="track known hands in padded crops instead of searching the whole frame every time")
+    parser.add_argument("--adaptive-cadence", action="store_true",
+                        help="when inference blows the frame budget, skip it on some frames and extrapolate hands")
+    parser.add_argument("--filter", choices=list(FILTERS), default=None,
+                        help="smoothing filter for hand anchors and scale (default: one_euro)")
+    parser.add_argument("--filter-landmarks", action="store_true",
+                        help="also smooth all 21 landmarks (exoskeleton, drawing and pinch use them)")
+    parser.add_argument("--no-predict", action="store_true",
+                        help="don't predict hands forward by the measured capture-to-display latency")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="skip hand/pose inference while the scene is static and no hands are in view")
+    parser.add_argument("--inference-cache", nargs="?", const=".inference_cache", default=None, metavar="DIR",
+                        help="cache landmark results on disk for file sources, so replays skip inference "
+                             "(default dir: %(const)s)")
+    parser.add_argument("--tracker-process", action="store_true",
+                        help="run hand/pose tracking in a separate process (frames shared via shared memory)")
+    parser.add_argument("--num-hands", type=int, choices=range(1, 9), default=None, metavar="1-8",
+                        help="how many hands to track at once (default: 2)")
+    parser.add_argument("--idle-after", type=float, default=IDLE_AFTER_S,
+                        help="seconds without hands before a live camera drops to idle rate (0 = never idle)")
+    parser.add_argument("--model-dir", default=None,
+                        help="model store directory (default: src/, see model_store.py)")
+    parser.add_argument("--offline", action="store_true",
+                        help="never download models; missing ones must be installed with model_store.py")
+    parser.add_argument("--max-frames", type=int, default=0, help="stop after this many frames (0 = no limit)")
+    return parser.parse_args(argv)
+
+def create_tracker(args, running_mode, live):
+    """Imports and builds the tracker. mediapipe is by far the slowest import, so this
+    runs on a loader thread while the camera, audio and effects start up."""
+    if args.tracker_process:
+        # A separate process keeps tracking off this process's GIL, at the cost of a frame or two of lag
+        from tracker_process import TrackerProcess as tracker_class
+    else:
+        from hand_tracker import HologramTracker as tracker_class
+
+    options = {
+        "running_mode": running_mode,
+        "roi_mode": args.roi,
+        "adaptive_cadence": args.adaptive_cadence,
+        "filter_landmarks": args.filter_landmarks,
+        "motion_gate": args.motion_gate,
+        # Live frames never repeat, so only recorded input is worth caching
+        "cache_dir": args.inference_cache if not live else None,
+        "offline": args.offline,
+    }
+    # Unset options keep the tracker's own defaults
+    for name, value in (("inference_scale", args.inference_scale), ("filter_kind", args.filter), ("num_hands", args.num_hands),
+                        ("model_dir", args.model_dir)):
+        if value is not None:
+            options[name] = value
+    return tracker_class(**options)
+
+def main(argv=None):
+    args = parse_args(argv)
+    headless = args.headless
+    timer = StartupTimer()
+    live = is_live_spec(args.source)
+    # Live cameras overlap hand inference with rendering; recorded input runs frame-exact in VIDEO mode.
+    # Options that need synchronous results switch cameras to VIDEO mode too, unless a mode was asked for
+    sync_flags = [flag for flag, enabled in (("--roi", args.roi), ("--adaptive-cadence", args.adaptive_cadence)) if enabled]
+    tracker_mode = args.tracker_mode or ("live_stream" if live and not sync_flags else "video")
+    if tracker_mode == "live_stream" and sync_flags:
+        print(f"Ignoring {', '.join(sync_flags)}: not supported in live_stream mode (use --tracker-mode video)")
+
+    # Models and audio load on their own threads while the camera opens and the effects build here
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as loader:
+        tracker_future = loader.submit(timer.timed, "models", create_tracker, args, tracker_mode, live)
+        audio_future = loader.submit(timer.timed, "audio", AudioManager, enabled=not headless)
+
+        with timer.phase("camera"):
+            cap = open_frame_source(args.source, loop=args.loop, camera_config=CAMERA_CONFIG, camera_tune=CAMERA_AUTOTUNE)
+
+        with timer.phase("effects"):
+            diamond = HologramDiamond(size=50)
+            repulsor = Repulsor(base_radius=50)
+            glove = Exoskeleton()
+            compositor = Compositor()
+            shield = EnergyShield()
+            reactor = ArcReactor()
+            canvas = ARCanvas()
+            theme_mgr = ThemeManager()
+
+            try:
+                hud_font = ImageFont.truetype("assets/fonts/Orbitron.ttf", 30)
+                title_font = ImageFont.truetype("assets/fonts/Orbitron.ttf", 40)
+            except IOError:
+                print("Font not found, using default OpenCV font")
+                hud_font = None
+                title_font = None
+
+        tracker = tracker_future.result()
+        audio = audio_future.result()
+
+    # First real detect() pays for graph setup; pay it now, before the first frame is shown
+    with timer.phase("warm-up"):
+        warm_up_shape = (CAMERA_CONFIG.height, CAMERA_CONFIG.width, 3) if live else (720, 1280, 3)
+        tracker.warm_up(warm_up_shape, want_pose=True)
+    timer.report()
+
+    # Only live sources stamp frames with the monotonic clock, so only they can measure latency
+    predict_latency = cap.is_live and not args.no_predict
+    latency_ms = None # smoothed age of the hand landmarks when the frame is shown
 
     draw_mode = False
     scale_mode = False
+    reactor_enabled = True # Arc reactor is the (only) consumer of pose tracking
     game = GameManager()
     
-    repulsor_cooldown_until = {"Left": 0.0, "Right": 0.0}
-    firing_armed = {"Left": False, "Right": False} # Prevent misfires on pose entry
-    prev_pose = {"Left": "NONE", "Right": "NONE"} # Track pose changes
-    pending_fire_start = {"Left": 0.0, "Right": 0.0} # Time when thrust was initiated
+    # Per-hand weapon state, indexed by the hand's track slot (see hand_tracks.py)
+    repulsor_cooldown_until = np.zeros(tracker.num_hands)
+    firing_armed = np.zeros(tracker.num_hands, dtype=bool) # Prevent misfires on pose entry
+    prev_pose = ["NONE"] * tracker.num_hands # Track pose changes
+    pending_fire_start = np.zeros(tracker.num_hands) # Time when thrust was initiated
+    slot_track = np.full(tracker.num_hands, -1) # Track ID the state in each slot belongs to
     
     # Screenshot System
     screenshot_countdown_start = 0.0
@@ -71,9 +225,28 @@ def main():
     print("3. Pinch your fingers together to shrink it.")
     print("4. Press 'q' to quit.")
     
+    # Idle power mode for kiosks: low frame rate until someone shows up
+    idle_monitor = IdleMonitor(cap, idle_after=args.idle_after) if cap.is_live and args.idle_after > 0 else None
+
+    last_frame_shape = (720, 1280, 3)
+    fps_counter = FPSCounter()
     while cap.isOpened():
-        success, frame = cap.read()
-        if not success: continue
+        if args.max_frames and fps_counter.frames >= args.max_frames:
+            break
+
+        # Blocks until the capture thread has a newer frame (never returns a stale one)
+        success, frame = cap.read(timeout=0.25)
+        if not success:
+            # Camera hiccup or unplugged: the capture supervisor is backing off and reopening,
+            # so just keep the window responsive with a cached screen
+            if headless:
+                continue
+            if not cap.has_signal():
+                cv2.imshow('AR Interactive Hologram', get_no_signal_frame(last_frame_shape))
+            if cv2.waitKey(30) & 0xFF == ord('q'):
+                break
+            continue
+        last_frame_shape = frame.shape
         
         #flip the frame horizontally for a natural mirror-like AR experience
         frame = cv2.flip(frame, 1)
@@ -81,10 +254,13 @@ def main():
         #convert to RGB for the AI
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
-        #anchor coordinates
-        tracking_data = tracker.get_anchor_point(frame_rgb)
+        #anchor coordinates and chest position (hand and pose inference run concurrently)
+        tracking_data, chest_pos = tracker.process_frame(frame_rgb, timestamp_ms=cap.last_timestamp * 1000, want_pose=reactor_enabled)
 
-        key = cv2.waitKey(1) & 0xFF
+        if idle_monitor is not None and idle_monitor.update(bool(tracking_data) or game.game_mode or screenshot_active):
+            print(f"Power: {idle_monitor.state}")
+
+        key = cv2.waitKey(1) & 0xFF if not headless else 0xFF
         if key == ord('q'):
             break
         elif key == ord('d'):
@@ -106,6 +282,10 @@ def main():
         # --- GAME MODE SYSTEM ---
         game.update(frame, canvas)
 
+        # --- ARC REACTOR (chest tracking) ---
+        if reactor_enabled:
+            reactor.draw(frame, chest_pos, theme=theme_mgr.get())
+
         # Always draw the spawned shapes and explosions, even if no hand is detected
         canvas.render_shapes(frame)
 
@@ -116,30 +296,45 @@ def main():
 
         #draw the anchor if it exists
         if tracking_data:
+            # Always draw the Exoskeleton, regardless of mode or pose. Every glove goes into the
+            # shared translucent layer and is blended once, under the weapons drawn below
+            compositor.begin(frame.shape)
+            for hand in tracking_data:
+                glove.draw(compositor, hand, theme=theme_mgr.get())
+            compositor.composite(frame)
+
             any_repulsor_active = False
-            for hand_data in tracking_data:
-                anchor, scale_multiplier, pose_type, landmarks, is_firing, speed, handedness = hand_data
+            for hand in tracking_data:
+                anchor = hand.anchor
+                scale_multiplier = hand.scale
+                pose_type = hand.pose_type
+                is_firing = hand.is_firing
+                slot = hand.slot
+                if slot_track[slot] != hand.track_id:
+                    # A different hand took over this slot, don't inherit its cooldowns
+                    slot_track[slot] = hand.track_id
+                    repulsor_cooldown_until[slot] = 0.0
+                    firing_armed[slot] = False
+                    prev_pose[slot] = "NONE"
+                    pending_fire_start[slot] = 0.0
                 
                 # Reset sequence if pose changes
-                if pose_type != prev_pose[handedness] and not draw_mode:
-                    pending_fire_start[handedness] = 0.0
-                prev_pose[handedness] = pose_type
-
-                # Always draw the Exoskeleton, regardless of mode or pose
-                glove.draw(frame, landmarks, theme=theme_mgr.get())
+                if pose_type != prev_pose[slot] and not draw_mode:
+                    pending_fire_start[slot] = 0.0
+                prev_pose[slot] = pose_type
 
                 if draw_mode:
-                    # Route raw landmarks into the Canvas
-                    canvas.process_interactions(frame, landmarks)
+                    # Route the hand record into the Canvas
+                    canvas.process_interactions(frame, hand)
                     # Clear weapon state so nothing carries over
-                    pending_fire_start[handedness] = 0.0
-                    firing_armed[handedness] = False
+                    pending_fire_start[slot] = 0.0
+                    firing_armed[slot] = False
                 elif scale_mode:
                     # Suspend weapons and drawing, but allow grabbing/moving shapes
                     if not is_dual_scaling:
-                        canvas.process_interactions(frame, landmarks, allow_drawing=False)
-                    pending_fire_start[handedness] = 0.0
-                    firing_armed[handedness] = False
+                        canvas.process_interactions(frame, hand, allow_drawing=False)
+                    pending_fire_start[slot] = 0.0
+                    firing_armed[slot] = False
                 else:
                     # Render weapons conditionally
                     if pose_type == "REPULSOR":
@@ -183,8 +378,8 @@ def main():
                             cv2.line(frame, (cx, cy + radius + 10), (cx, cy + radius - 10), (0, 0, 255), 2)
 
                         # Logic: If already charging to fire, handle the sequence
-                        if pending_fire_start[handedness] > 0:
-                            elapsed = time.time() - pending_fire_start[handedness]
+                        if pending_fire_start[slot] > 0:
+                            elapsed = time.time() - pending_fire_start[slot]
                             
                             if elapsed < 0.3:
                                 # Charging phase: Show progress and visuals
@@ -214,24 +409,25 @@ def main():
                                 game.process_repulsor_aoe(canvas, hx, hy)
                                     
                                 # Reset sequence
-                                pending_fire_start[handedness] = 0.0
-                                repulsor_cooldown_until[handedness] = time.time() + 0.4
+                                pending_fire_start[slot] = 0.0
+                                repulsor_cooldown_until[slot] = time.time() + 0.4
                                 r_status, r_color = "COOLDOWN", (0, 0, 255)
                         
                         else:
                             # Waiting for trigger
-                            if time.time() < repulsor_cooldown_until[handedness]:
+                            if time.time() < repulsor_cooldown_until[slot]:
                                 r_status, r_color = "COOLING DOWN", (0, 150, 255) # Orange Warning
                             else:
                                 r_status, r_color = "ENGAGED", (255, 255, 0) # Cyan Ready
                             
                             # Trigger detection
-                            if not is_firing:
-                                firing_armed[handedness] = True
+                            # Only real inference results may re-arm the trigger, extrapolated frames never fire
+                            if not is_firing and not hand.predicted:
+                                firing_armed[slot] = True
                                 
-                            if is_firing and firing_armed[handedness] and time.time() > repulsor_cooldown_until[handedness]:
-                                pending_fire_start[handedness] = time.time()
-                                firing_armed[handedness] = False
+                            if is_firing and firing_armed[slot] and time.time() > repulsor_cooldown_until[slot]:
+                                pending_fire_start[slot] = time.time()
+                                firing_armed[slot] = False
                                 
                     elif pose_type == "DIAMOND":
                         diamond.draw(frame, anchor, scale_multiplier)
@@ -257,9 +453,6 @@ def main():
             # If hand is completely off screen, silence weapons
             audio.stop_charge()
 
-        # --- POSE/CHEST TRACKING ---
-        chest_pos = tracker.get_pose_data(frame_rgb)
-
         # --- SCREENSHOT COUNTDOWN ---
         if screenshot_active:
             elapsed = time.time() - screenshot_countdown_start
@@ -296,42 +489,35 @@ def main():
                 screenshot_cooldown_until = time.time() + 5.0  # 5s cooldown
 
         #add text overlay
-        if hud_font and title_font:
-            pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            draw = ImageDraw.Draw(pil_img)
-            
-            # Using RGB colors for Pillow since we converted to RGB
-            draw.text((30, 40), "HOLOGRAM AR SYSTEM", font=title_font, fill=(0, 255, 255))
-            draw.text((30, 100), f"REPULSOR SYS:   {r_status}", font=hud_font, fill=r_color[::-1])
-            draw.text((30, 148), f"DIAMOND  SYS:   {d_status}", font=hud_font, fill=d_color[::-1])
-            draw.text((30, 196), f"SHIELD   SYS:   {s_status}", font=hud_font, fill=s_color[::-1])
-            draw.text((30, 244), f"DRAW     MODE:  {dm_status}", font=hud_font, fill=dm_color[::-1])
-            draw.text((30, 292), f"SCALE    MODE:  {sm_status}", font=hud_font, fill=sm_color[::-1])
-            draw.text((30, 340), f"GAME     MODE:  {gm_status}", font=hud_font, fill=gm_color[::-1])
-            draw.text((30, 388), f"ARMOR    SYS:   {theme_mgr.get_name()}", font=hud_font, fill=theme_mgr.get()['hud_accent'])
-            
-            # --- MISSION HUD OVERLAY ---
-            game.draw_hud_pillow(draw, title_font, frame.shape)
-            
-            frame = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-        else:
-            cv2.putText(frame, "HOLOGRAM AR SYSTEM", (30, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (255, 255, 0), 2, cv2.LINE_AA)
-            cv2.putText(frame, f"REPULSOR SYS:   {r_status}", (30, 110), cv2.FONT_HERSHEY_SIMPLEX, 1.0, r_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"DIAMOND  SYS:   {d_status}", (30, 158), cv2.FONT_HERSHEY_SIMPLEX, 1.0, d_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"SHIELD   SYS:   {s_status}", (30, 206), cv2.FONT_HERSHEY_SIMPLEX, 1.0, s_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"DRAW     MODE:  {dm_status}", (30, 254), cv2.FONT_HERSHEY_SIMPLEX, 1.0, dm_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"SCALE    MODE:  {sm_status}", (30, 302), cv2.FONT_HERSHEY_SIMPLEX, 1.0, sm_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"GAME     MODE:  {gm_status}", (30, 350), cv2.FONT_HERSHEY_SIMPLEX, 1.0, gm_color, 2, cv2.LINE_AA)
-            cv2.putText(frame, f"ARMOR    SYS:   {theme_mgr.get_name()}", (30, 398), cv2.FONT_HERSHEY_SIMPLEX, 1.0, theme_mgr.get()['hud_accent'], 2, cv2.LINE_AA)
-            
-            # --- MISSION HUD OVERLAY ---
-            game.draw_hud_cv2(frame)
+        status_lines = [
+            ("REPULSOR SYS:   ", r_status, r_color),
+            ("DIAMOND  SYS:   ", d_status, d_color),
+            ("SHIELD   SYS:   ", s_status, s_color),
+            ("DRAW     MODE:  ", dm_status, dm_color),
+            ("SCALE    MODE:  ", sm_status, sm_color),
+            ("GAME     MODE:  ", gm_status, gm_color),
+        ]
+        draw_hud(frame, hud_font, title_font, status_lines, theme_mgr, game)
+
+        fps_counter.tick()
+        if headless:
+            continue
 
         #show the live feed
         cv2.imshow('AR Interactive Hologram', frame)
 
+        if predict_latency and tracking_data and not tracking_data[0].predicted:
+            # How old the landmarks are on screen; the filters predict this far ahead next frame
+            sample = time.monotonic() * 1000 - tracker.result_timestamp_ms
+            latency_ms = sample if latency_ms is None else latency_ms + 0.1 * (sample - latency_ms)
+            tracker.prediction_ms = min(latency_ms, MAX_PREDICTION_MS)
+
         # Keyboard inputs
         key = cv2.waitKey(1) & 0xFF
+        if key != 0xFF and idle_monitor is not None:
+            # Someone is at the keyboard
+            if idle_monitor.update(True):
+                print(f"Power: {idle_monitor.state}")
         if key == ord('q'):
             break
         elif key == ord('d'):
@@ -348,14 +534,30 @@ def main():
             game.toggle_game_mode(canvas)
         elif key == ord('t'):
             theme_mgr.cycle()
+        elif key == ord('r'):
+            reactor_enabled = not reactor_enabled
         elif key == ord('p'):
             if not screenshot_active and time.time() > screenshot_cooldown_until:
                 screenshot_active = True
                 screenshot_countdown_start = time.time()
 
+    print(f"Processed {fps_counter.report()}")
+    print(f"Source: {cap.frames_captured} frames captured, {cap.dropped_frames} dropped")
+    if tracker.cadence is not None:
+        print(f"Hand inference: {tracker.cadence.inferred} frames inferred, {tracker.cadence.skipped} extrapolated")
+    if tracker.cache is not None:
+        print(f"Inference cache: {tracker.cache.hits} hits, {tracker.cache.misses} misses")
+    if idle_monitor is not None:
+        print(f"Power: went idle {idle_monitor.idle_periods} times")
+    if tracker.motion_gate is not None:
+        print(f"Motion gate: {tracker.motion_gate.gated} frames skipped as static")
+    if args.tracker_process:
+        print(f"Tracker process: {tracker.dropped_frames} frames not tracked (worker busy)")
     audio.cleanup()
+    tracker.close()
     cap.release()
-    cv2.destroyAllWindows()
+    if not headless:
+        cv2.destroyAllWindows()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Local store for the MediaPipe model files.
+
+Models are downloaded from versioned URLs and checked against the sha256 digests
+pinned in model_pins.json, which is tracked next to this file; nothing is trusted
+just because it was there first. Every install (download or local file) is written
+to a temp file, checked against its pin and then renamed into place, so a
+half-written or substituted model can never be picked up. Every load verifies the
+checksum again. In offline mode nothing is ever downloaded; missing models have to
+be installed from a local file:
+
+    python src/model_store.py install ~/Downloads/hand_landmarker.task
+    python src/model_store.py verify
+
+Moving to a new model version means changing its URL in MODELS, then running
+"python src/model_store.py pin" on a trusted network and committing model_pins.json.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import urllib.request
+import zipfile
+
+#versioned URLs: "latest" would change under the pinned digests
+MODELS = {
+    "hand_landmarker.task": "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task",
+    "pose_landmarker_lite.task": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task",
+}
+
+#default store location (where the app has always kept its models)
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+#expected sha256 of every model, tracked in the repo (see "pin" below)
+PINS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_pins.json")
+
+#seconds before a stalled download gives up instead of hanging startup
+DOWNLOAD_TIMEOUT = 30
+
+def file_digest(path, chunk_size=1 << 20):
+    """sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_pins(path=PINS_PATH):
+    """{model name: pinned sha256 or None}"""
+    with open(path) as f:
+        pins = json.load(f)
+    return {name: pins.get(name) for name in MODELS}
+
+def write_pins(pins, path=PINS_PATH):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(pins, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+def fetch(name, dst):
+    """Streams a model's URL into the open file dst."""
+    with urllib.request.urlopen(MODELS[name], timeout=DOWNLOAD_TIMEOUT) as response:
+        shutil.copyfileobj(response, dst)
+    dst.flush()
+    os.fsync(dst.fileno())
+
+def is_intact_bundle(path):
+    """.task models are zip bundles, so a torn download fails the archive's own CRC checks."""
+    try:
+        with zipfile.ZipFile(path) as bundle:
+            return bundle.testzip() is None
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+class ModelStore:
+    def __init__(self, directory=MODEL_DIR, offline=False, pins=None):
+        self.directory = directory
+        self.offline = offline
+        self.pins = load_pins() if pins is None else pins
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def digest(self, name):
+        """Pinned sha256 of a model: what every installed copy is checked against."""
+        digest = self.pins.get(name)
+        if not digest:
+            raise RuntimeError(
+                f"No sha256 pinned for {name} in {PINS_PATH}. On a trusted network, run "
+                f"python src/model_store.py pin, check the result and commit it.")
+        return digest
+
+    def _install_temp(self, name, tmp_path):
+        """Checks a fully written temp file in the store directory against its pin and renames it into place."""
+        digest = file_digest(tmp_path)
+        if digest != self.digest(name):
+            raise ValueError(f"{name} has sha256 {digest}, expected {self.digest(name)} (see {PINS_PATH})")
+        os.replace(tmp_path, self.path(name))
+        return digest
+
+    def install(self, name, source_path):
+        """Atomically installs a local copy of a model."""
+        if name not in MODELS:
+            raise ValueError(f"Unknown model {name!r}, expected one of {list(MODELS)}")
+        if not is_intact_bundle(source_path):
+            raise ValueError(f"{source_path} is not a complete .task bundle")
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst, open(source_path, "rb") as src:
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            return self._install_temp(name, tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def download(self, name):
+        if self.offline:
+            raise RuntimeError(
+                f"{name} is missing or damaged in {self.directory} and offline mode is on. "
+                f"Install it from a local copy: python src/model_store.py install /path/to/{name}")
+        self.digest(name)  # don't download what can't be verified
+        print(f"Downloading {name}...")
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                fetch(name, dst)
+            if not is_intact_bundle(tmp_path):
+                raise RuntimeError(f"Downloaded {name} is not a complete .task bundle")
+            digest = self._install_temp(name, tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print("Download complete.")
+        return digest
+
+    def ensure(self, name):
+        """Returns the model's path, downloading it if it's missing (unless offline)."""
+        path = self.path(name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            self.download(name)
+        return path
+
+    def verify(self, name):
+        return os.path.exists(self.path(name)) and file_digest(self.path(name)) == self.pins.get(name)
+
+    def verified_path(self, name):
+        """Path of a model whose contents match its pin, for BaseOptions(model_asset_path=...).
+        A file left by an interrupted or older download fails the check and is re-fetched once.
+
+        The checksum pass reads the file through an mmap, straight from the page cache,
+        and makes no private copy; MediaPipe then maps the same file itself."""
+        expected = self.digest(name)  # an unpinned model fails here, before any download
+        for attempt in range(2):
+            path = self.ensure(name)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hashlib.sha256(mapped).hexdigest() == expected:
+                    return path
+            print(f"Checksum mismatch for {name}")
+            if attempt == 0:
+                # Re-fetch once (raises in offline mode)
+                self.download(name)
+        raise RuntimeError(f"{name} still fails its checksum after re-downloading")
+
+def pin(files):
+    """Records the sha256 of every model in model_pins.json, from the given local files
+    or else freshly downloaded. Only run this on a trusted network, then review the diff."""
+    sources = {os.path.basename(f): f for f in files}
+    unknown = [name for name in sources if name not in MODELS]
+    if unknown:
+        raise ValueError(f"Unknown model {unknown[0]!r}, expected one of {list(MODELS)}")
+    pins = load_pins()
+    for name in sources or MODELS:
+        tmp_path = None
+        try:
+            if name in sources:
+                path = sources[name]
+            else:
+                print(f"Downloading {name}...")
+                fd, tmp_path = tempfile.mkstemp(suffix=".task")
+                with os.fdopen(fd, "wb") as dst:
+                    fetch(name, dst)
+                path = tmp_path
+            if not is_intact_bundle(path):
+                raise RuntimeError(f"{path} is not a complete .task bundle")
+            pins[name] = file_digest(path)
+        finally:
+            if tmp_path is not None:
+                os.remove(tmp_path)
+        print(f"{name:<28} {pins[name]}")
+    write_pins(pins)
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model store")
+    parser.add_argument("--dir", default=MODEL_DIR, help="model store directory (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    install = sub.add_parser("install", help="install a model from a local file")
+    install.add_argument("file")
+    install.add_argument("--name", choices=list(MODELS), help="model name (default: the file's name)")
+    sub.add_parser("download", help="download every missing model")
+    sub.add_parser("verify", help="check every installed model against its pinned sha256")
+    pin_cmd = sub.add_parser("pin", help="record the sha256 of the models in model_pins.json (maintainers)")
+    pin_cmd.add_argument("files", nargs="*", help="local copies to pin instead of downloading")
+    args = parser.parse_args()
+
+    if args.command == "pin":
+        pin(args.files)
+        return
+    store = ModelStore(args.dir)
+    if args.command == "install":
+        name = args.name or os.path.basename(args.file)
+        print(f"Installed {name}: sha256 {store.install(name, args.file)}")
+    elif args.command == "download":
+        for name in MODELS:
+            store.ensure(name)
+    else:
+        for name in MODELS:
+            if not store.pins.get(name):
+                status = "NOT PINNED"
+            elif not os.path.exists(store.path(name)):
+                status = "MISSING"
+            else:
+                status = "ok" if store.verify(name) else "BAD CHECKSUM"
+            print(f"{name:<28} {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cheap motion gate in front of the landmarkers.
+
+Each frame is shrunk to a tiny grayscale thumbnail and compared against a slowly
+updated running background. If only a handful of thumbnail pixels changed, the
+scene is considered static and the tracker can skip inference entirely.
+"""
+import cv2
+import numpy as np
+
+#width of the thumbnail the comparison runs on (height follows the aspect ratio)
+GATE_WIDTH = 64
+
+#a thumbnail pixel counts as changed when it differs from the background by more than this (0-255)
+PIXEL_THRESHOLD = 18
+
+#share of changed thumbnail pixels that counts as motion
+MOTION_FRACTION = 0.004
+
+#how fast the background absorbs the current frame (lighting drift, things that stop moving)
+BACKGROUND_ALPHA = 0.05
+
+class MotionGate:
+    def __init__(self, width=GATE_WIDTH, pixel_threshold=PIXEL_THRESHOLD, motion_fraction=MOTION_FRACTION,
+                 background_alpha=BACKGROUND_ALPHA):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.background_alpha = background_alpha
+
+        # Preallocated thumbnail buffers, (re)built when the frame size changes
+        self._frame_shape = None
+        self._small = None
+        self._gray = None
+        self._diff = None
+        self._background = None
+
+        # Stats
+        self.gated = 0  # frames where inference was skipped
+
+    def _allocate(self, frame_shape):
+        self._frame_shape = frame_shape
+        h, w = frame_shape[:2]
+        gh = max(1, int(round(h * self.width / w)))
+        self._small = np.empty((gh, self.width, 3), dtype=np.uint8)
+        self._gray = np.empty((gh, self.width), dtype=np.uint8)
+        self._diff = np.empty((gh, self.width), dtype=np.uint8)
+        self._background = None
+
+    def has_motion(self, frame_rgb):
+        """Updates the background and returns True if the frame differs from it noticeably.
+        The first frame (and the first after a size change) always counts as motion."""
+        if frame_rgb.shape != self._frame_shape:
+            self._allocate(frame_rgb.shape)
+
+        cv2.resize(frame_rgb, (self.width, self._small.shape[0]), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_RGB2GRAY, dst=self._gray)
+
+        if self._background is None:
+            self._background = self._gray.astype(np.float32)
+            return True
+
+        cv2.absdiff(self._gray, self._background.astype(np.uint8), dst=self._diff)
+        changed = np.count_nonzero(self._diff > self.pixel_threshold)
+        cv2.accumulateWeighted(self._gray, self._background, self.background_alpha)
+        return bool(changed > self.motion_fraction * self._diff.size)
@@ -0,0 +1,53 @@
+"""
+Idle power mode.
+
+When nobody has been in front of the camera for a while, the main loop drops to a
+few frames per second: the camera is throttled and inference runs only on those
+frames. The first detected hand switches everything back to full rate on the same frame.
+"""
+import time
+
+STATE_ACTIVE = "ACTIVE"
+STATE_IDLE = "IDLE"
+
+#seconds without hands (or anything else going on) before going idle
+IDLE_AFTER_S = 10.0
+
+#capture/inference rate while idle
+IDLE_FPS = 5.0
+
+class IdleMonitor:
+    """Tracks ACTIVE/IDLE and throttles the frame source (set_frame_interval) on every change."""
+
+    def __init__(self, source, idle_after=IDLE_AFTER_S, idle_fps=IDLE_FPS):
+        self.source = source
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.state = STATE_ACTIVE
+        self._last_activity = time.monotonic()
+
+        # Stats
+        self.idle_periods = 0
+
+    @property
+    def idle(self):
+        return self.state == STATE_IDLE
+
+    def update(self, active, now=None):
+        """Call once per frame. active: hands detected or anything else that needs full rate.
+        Returns True if the state changed on this call."""
+        now = time.monotonic() if now is None else now
+        if active:
+            self._last_activity = now
+            if self.state == STATE_IDLE:
+                self.state = STATE_ACTIVE
+                self.source.set_frame_interval(0)
+                return True
+            return False
+
+        if self.state == STATE_ACTIVE and now - self._last_activity >= self.idle_after:
+            self.state = STATE_IDLE
+            self.idle_periods += 1
+            self.source.set_frame_interval(self.idle_interval)
+            return True
+        return False
@@ -4,16 +4,12 @@ import math
 def process_scaling(frame, tracking_data, scale_mode, canvas, sm_status, sm_color):
     is_dual_scaling = False
     
-    if tracking_data and scale_mode and len(tracking_data) == 2:
-        h, w, _ = frame.shape
+    if tracking_data and scale_mode and len(tracking_data) >= 2:
         pinching_hands = []
-        for hand_data in tracking_data:
-            landmarks = hand_data[3]
-            ix, iy = int(landmarks[8].x * w), int(landmarks[8].y * h)
-            tx, ty = int(landmarks[4].x * w), int(landmarks[4].y * h)
+        for hand in tracking_data:
             # Expanded pinch sensitivity specifically for scaling mode so it doesn't drop
-            if math.sqrt((ix - tx)**2 + (iy - ty)**2) < 70.0:
-                pinching_hands.append((ix, iy))
+            if hand.pinch_dist < 70.0:
+                pinching_hands.append(hand.point_tuples[8])
         
         if len(pinching_hands) == 2:
             is_dual_scaling = True
@@ -0,0 +1,37 @@
+"""
+Startup phase timing.
+
+Phases may run on loader threads at the same time, so the report shows each phase's
+own duration next to when it started, plus the wall time to the first frame.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (name, started at (s since start), duration (s))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, begin - self.start, end - begin))
+
+    def timed(self, name, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) as a phase, handy for executor.submit()."""
+        with self.phase(name):
+            return fn(*args, **kwargs)
+
+    def report(self):
+        total = time.perf_counter() - self.start
+        print("Startup:")
+        for name, began, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            print(f"  {name:<10} {duration * 1000:>7.0f} ms  (from +{began * 1000:.0f} ms)")
+        print(f"  {'ready':<10} {total * 1000:>7.0f} ms")
@@ -0,0 +1,257 @@
+"""
+Out-of-process hand tracking.
+
+TrackerProcess runs a HologramTracker in a separate process so MediaPipe's Python-side
+work (mp.Image wrapping, result unpacking, gestures, filters) doesn't fight the drawing
+code for the GIL. Nothing big is pickled:
+  - frames go through a ring of RING_SLOTS frame-sized slots in shared memory
+  - results come back as fixed-size structured records in a second shared buffer,
+    one record per ring slot
+Only slot numbers and a few scalars travel through the queues.
+
+Like live_stream mode, process_frame() queues the frame and returns the most recent
+completed result, so tracking runs one or two frames behind the display.
+"""
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+from hand_tracker import HologramTracker, HandRecord, NUM_HANDS
+
+#frames that can be in flight at once; when every slot is busy new frames are dropped
+RING_SLOTS = 3
+
+#hands per result record (the most HologramTracker's num_hands is meant to go)
+MAX_HANDS = 8
+
+#slot number the worker acknowledges a warm-up with
+WARM_UP_DONE = -1
+
+#how long close() waits for the worker to shut down its landmarkers
+SHUTDOWN_TIMEOUT = 5.0
+
+#while blocked on the worker, check this often (seconds) that it is still alive
+WORKER_POLL_INTERVAL = 0.5
+
+POSE_CODES = ["NONE", "REPULSOR", "DIAMOND", "SHIELD"]
+FIRING_CODES = [False, "CAMERA", "TARGET"]
+HANDEDNESS_CODES = ["Left", "Right"]
+
+HAND_DTYPE = np.dtype([
+    ("landmarks", np.float32, (21, 3)),
+    ("anchor", np.int32, 2),
+    ("scale", np.float32),
+    ("speed", np.float32),
+    ("pose", np.int8),
+    ("firing", np.int8),
+    ("handedness", np.int8),
+    ("predicted", np.bool_),
+    ("track_id", np.int64),
+    ("slot", np.int16),
+])
+
+RESULT_DTYPE = np.dtype([
+    ("result_ts", np.float64),
+    ("chest", np.int32, 2),
+    ("has_chest", np.bool_),
+    ("n_hands", np.int32),
+    ("hands", HAND_DTYPE, MAX_HANDS),
+])
+
+def pack_result(record, tracking_data, chest_pos, result_ts):
+    """Writes one frame's output into a RESULT_DTYPE record (in place)."""
+    record["result_ts"] = result_ts
+    record["has_chest"] = chest_pos is not None
+    if chest_pos is not None:
+        record["chest"] = chest_pos
+    hands = tracking_data[:MAX_HANDS]
+    record["n_hands"] = len(hands)
+    for slot, hand in zip(record["hands"], hands):
+        slot["landmarks"] = hand.landmarks
+        slot["anchor"] = hand.anchor
+        slot["scale"] = hand.scale
+        slot["speed"] = hand.speed
+        slot["pose"] = POSE_CODES.index(hand.pose_type)
+        slot["firing"] = FIRING_CODES.index(hand.is_firing)
+        slot["handedness"] = HANDEDNESS_CODES.index(hand.handedness)
+        slot["predicted"] = hand.predicted
+        slot["track_id"] = hand.track_id
+        slot["slot"] = hand.slot
+
+def unpack_result(record, w, h):
+    """RESULT_DTYPE record -> (tracking_data, chest_pos, result_ts). Copies out of shared memory."""
+    frame_size = np.array((w, h), dtype=np.float32)
+    tracking_data = []
+    for slot in record["hands"][:int(record["n_hands"])]:
+        landmarks = slot["landmarks"].copy()
+        tracking_data.append(HandRecord(
+            anchor=tuple(slot["anchor"].tolist()),
+            scale=float(slot["scale"]),
+            pose_type=POSE_CODES[slot["pose"]],
+            is_firing=FIRING_CODES[slot["firing"]],
+            speed=float(slot["speed"]),
+            handedness=HANDEDNESS_CODES[slot["handedness"]],
+            landmarks=landmarks,
+            points=(landmarks[:, :2] * frame_size).astype(np.int32),
+            predicted=bool(slot["predicted"]),
+            track_id=int(slot["track_id"]),
+            slot=int(slot["slot"])
+        ))
+    chest_pos = tuple(record["chest"].tolist()) if record["has_chest"] else None
+    return tracking_data, chest_pos, float(record["result_ts"])
+
+def _worker_main(tracker_kwargs, jobs, done):
+    """Worker process: attach to the shared buffers, then track every frame it's handed."""
+    tracker = HologramTracker(**tracker_kwargs)
+    frame_shm = result_shm = None
+    frames = results = None
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            if job[0] == "attach":
+                _, frame_name, result_name, shape = job
+                if frame_shm is not None:
+                    frame_shm.close()
+                    result_shm.close()
+                frame_shm = shared_memory.SharedMemory(name=frame_name)
+                result_shm = shared_memory.SharedMemory(name=result_name)
+                frames = np.ndarray((RING_SLOTS,) + shape, dtype=np.uint8, buffer=frame_shm.buf)
+                results = np.ndarray(RING_SLOTS, dtype=RESULT_DTYPE, buffer=result_shm.buf)
+                continue
+            if job[0] == "warm_up":
+                _, shape, want_pose = job
+                tracker.warm_up(shape, want_pose=want_pose)
+                done.put(WARM_UP_DONE)
+                continue
+
+            _, slot, timestamp_ms, want_pose, prediction_ms = job
+            tracker.prediction_ms = prediction_ms
+            # The landmarkers copy what they need, so the slot can be tracked in place
+            tracking_data, chest_pos = tracker.process_frame(frames[slot], timestamp_ms=timestamp_ms, want_pose=want_pose)
+            pack_result(results[slot], tracking_data, chest_pos, tracker.result_timestamp_ms)
+            done.put(slot)
+    finally:
+        frames = results = None  # drop the views before closing the mappings
+        if frame_shm is not None:
+            frame_shm.close()
+            result_shm.close()
+        tracker.close()
+
+class TrackerProcess:
+    """Drop-in stand-in for HologramTracker.process_frame() backed by a worker process.
+    Takes the same keyword arguments as HologramTracker."""
+
+    def __init__(self, **tracker_kwargs):
+        # spawn, not fork: MediaPipe and the capture thread don't survive a fork
+        ctx = mp.get_context("spawn")
+        self._jobs = ctx.Queue()
+        self._done = ctx.Queue()
+        self._worker = ctx.Process(target=_worker_main, args=(tracker_kwargs, self._jobs, self._done),
+                                   name="hand-tracker", daemon=True)
+        self._worker.start()
+
+        self._frame_shm = None
+        self._result_shm = None
+        self._frames = None
+        self._results = None
+        self._shape = None
+        self._free_slots = []
+
+        self.num_hands = tracker_kwargs.get("num_hands", NUM_HANDS)
+        self._tracking_data = []
+        self._chest_pos = None
+        self.result_timestamp_ms = -1
+        self.prediction_ms = 0.0
+        # Cadence and the motion gate run (and keep their stats) inside the worker
+        self.cadence = None
+        self.motion_gate = None
+        self.cache = None
+        self.dropped_frames = 0  # frames not sent because every ring slot was busy
+
+    def warm_up(self, shape=(720, 1280, 3), want_pose=True):
+        """Blocks until the worker has loaded its models and run the warm-up inference."""
+        self._jobs.put(("warm_up", shape, want_pose))
+        while self._wait_done() != WARM_UP_DONE:
+            pass
+
+    def _wait_done(self):
+        """Blocks for the worker's next finished slot. Raises if the worker dies instead."""
+        while True:
+            try:
+                return self._done.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._worker.is_alive():
+                    raise RuntimeError(f"Hand tracker process exited (code {self._worker.exitcode})")
+
+    def _allocate(self, shape):
+        self._release_buffers()
+        frame_bytes = int(np.prod(shape))
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=RING_SLOTS * frame_bytes)
+        self._result_shm = shared_memory.SharedMemory(create=True, size=RING_SLOTS * RESULT_DTYPE.itemsize)
+        self._frames = np.ndarray((RING_SLOTS,) + shape, dtype=np.uint8, buffer=self._frame_shm.buf)
+        self._results = np.ndarray(RING_SLOTS, dtype=RESULT_DTYPE, buffer=self._result_shm.buf)
+        self._shape = shape
+        self._free_slots = list(range(RING_SLOTS))
+        self._jobs.put(("attach", self._frame_shm.name, self._result_shm.name, shape))
+
+    def _collect(self, w, h):
+        """Takes in every finished slot and unpacks only the newest result. A shot fired in an
+        older result is carried over to the same track in the newest one, so it isn't lost."""
+        finished = []
+        while True:
+            try:
+                finished.append(self._done.get_nowait())
+            except queue.Empty:
+                break
+        if not finished:
+            return
+
+        fired = {}
+        for slot in finished[:-1]:
+            record = self._results[slot]
+            for hand in record["hands"][:int(record["n_hands"])]:
+                if hand["firing"]:
+                    fired[int(hand["track_id"])] = FIRING_CODES[hand["firing"]]
+        self._tracking_data, self._chest_pos, self.result_timestamp_ms = unpack_result(self._results[finished[-1]], w, h)
+        for hand in self._tracking_data:
+            if not hand.is_firing and hand.track_id in fired:
+                hand.is_firing = fired[hand.track_id]
+        self._free_slots.extend(finished)
+
+    def process_frame(self, frame_rgb, timestamp_ms=None, want_pose=False):
+        """Queues the frame for the worker and returns the most recent (tracking_data, chest_pos)."""
+        if not self._worker.is_alive():
+            raise RuntimeError(f"Hand tracker process exited (code {self._worker.exitcode})")
+        h, w, _ = frame_rgb.shape
+        if frame_rgb.shape != self._shape:
+            # Only in-flight slots reference the old buffers, wait for them before swapping
+            if self._shape is not None:
+                while len(self._free_slots) < RING_SLOTS:
+                    self._free_slots.append(self._wait_done())
+            self._allocate(frame_rgb.shape)
+
+        self._collect(w, h)
+        if self._free_slots:
+            slot = self._free_slots.pop(0)
+            self._frames[slot] = frame_rgb
+            self._jobs.put(("frame", slot, timestamp_ms, want_pose, self.prediction_ms))
+        else:
+            self.dropped_frames += 1
+        return self._tracking_data, (self._chest_pos if want_pose else None)
+
+    def _release_buffers(self):
+        self._frames = self._results = None
+        for shm in (self._frame_shm, self._result_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._frame_shm = self._result_shm = None
+
+    def close(self):
+        self._jobs.put(None)
+        self._worker.join(SHUTDOWN_TIMEOUT)
+        if self._worker.is_alive():
+            self._worker.terminate()
+        self._release_buffers()
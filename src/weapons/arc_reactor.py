@@ -0,0 +1,68 @@
+import cv2
+import math
+import time
+import numpy as np
+
+class ArcReactor:
+    def __init__(self, radius=28):
+        self.radius = radius
+        # Pre-rendered sprites keyed by (theme name, pulse step), built on first use
+        self.sprites = {}
+        self.pulse_steps = 4
+
+    def _build_sprite(self, theme, pulse):
+        glow_color = theme["reactor_glow"] if theme else (255, 255, 255)
+        ring_color = theme["reactor_ring"] if theme else (255, 255, 0)
+        core_color = theme["reactor_core"] if theme else (255, 255, 0)
+
+        r = self.radius
+        half = int(r * 1.8)
+        size = half * 2 + 1
+        c = (half, half)
+        sprite = np.zeros((size, size, 3), dtype=np.uint8)
+
+        # Soft outer glow, stronger on the brighter pulse steps
+        glow = np.zeros_like(sprite)
+        cv2.circle(glow, c, int(r * 1.2), core_color, int(r * 0.5))
+        glow = cv2.GaussianBlur(glow, (0, 0), r * 0.3)
+        cv2.addWeighted(glow, 0.5 + 0.5 * pulse, sprite, 0, 0, dst=sprite)
+
+        # Segmented outer ring (like the coil housing)
+        for i in range(10):
+            start = i * 36 + 4
+            cv2.ellipse(sprite, c, (r, r), 0, start, start + 28, ring_color, 3, cv2.LINE_AA)
+
+        # Inner ring and glowing core
+        cv2.circle(sprite, c, int(r * 0.65), ring_color, 2, cv2.LINE_AA)
+        cv2.circle(sprite, c, int(r * 0.4), core_color, -1, cv2.LINE_AA)
+        cv2.circle(sprite, c, int(r * 0.22), glow_color, -1, cv2.LINE_AA)
+        return sprite
+
+    def _get_sprite(self, theme, pulse_step):
+        key = (theme["name"] if theme else None, pulse_step)
+        if key not in self.sprites:
+            self.sprites[key] = self._build_sprite(theme, pulse_step / (self.pulse_steps - 1))
+        return self.sprites[key]
+
+    def draw(self, frame, chest_pos, theme=None):
+        """Additively stamps the cached reactor sprite centred on the chest."""
+        if chest_pos is None:
+            return
+
+        pulse_step = int((0.5 + 0.5 * math.sin(time.time() * 4)) * (self.pulse_steps - 1) + 0.5)
+        sprite = self._get_sprite(theme, pulse_step)
+
+        h, w, _ = frame.shape
+        half = sprite.shape[0] // 2
+        cx, cy = chest_pos
+        x0, y0 = cx - half, cy - half
+        x1, y1 = x0 + sprite.shape[1], y0 + sprite.shape[0]
+
+        # Clip to the frame
+        fx0, fy0 = max(0, x0), max(0, y0)
+        fx1, fy1 = min(w, x1), min(h, y1)
+        if fx0 >= fx1 or fy0 >= fy1:
+            return
+
+        roi = frame[fy0:fy1, fx0:fx1]
+        cv2.add(roi, sprite[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0], dst=roi)
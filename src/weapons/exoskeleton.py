@@ -1,6 +1,10 @@
 import cv2 
 import numpy as np
 
+#pixels the glove reaches past the landmark bounding box
+#(half the 26px palm rim, or the 14px joint caps, plus a pixel of slack)
+EXO_PADDING = 15
+
 class Exoskeleton:
     def __init__(self):
         self.finger_paths = [
@@ -12,25 +16,29 @@ class Exoskeleton:
         ]
         #main plate on back
         self.palm_path = [0, 5, 9, 13, 17]
-        
-    def draw (self, frame, hand_landmarks, theme=None):
-        #draw semi-transparent glove over hand
+
+    def draw (self, compositor, hand, theme=None):
+        #draw semi-transparent glove over hand (hand is the tracker's HandRecord)
+        #into the shared translucent layer, blended onto the frame by compositor.composite()
 
         # Use theme colors or defaults
         base_red = theme["exo_base"] if theme else (0, 0, 110)
         edge_red = theme["exo_edge"] if theme else (0, 0, 150)
         gold = theme["exo_accent"] if theme else (0, 200, 255)
 
-        h, w, _ = frame.shape
-        overlay = np.zeros((h, w, 3), dtype=np.uint8)
+        # Only the padded box around the hand is drawn and blended, not the whole frame
+        x0, y0, x1, y1 = hand.bbox
+        region = compositor.region(x0 - EXO_PADDING, y0 - EXO_PADDING, x1 + EXO_PADDING + 1, y1 + EXO_PADDING + 1)
+        if region is None:
+            return  # hand entirely off-screen
+        overlay, (x0, y0) = region
 
-        points = []
-        for lm in hand_landmarks:
-            points.append((int(lm.x * w), int(lm.y * h)))
+        # Landmark pixels (computed once per frame by the tracker) shifted into the ROI
+        local = hand.points - np.array([x0, y0], dtype=np.int32)
+        points = [tuple(p) for p in local.tolist()]
         
         # 1. Main Plate
-        palm_pts = np.array([points[i] for i in self.palm_path], np.int32)
-        palm_pts = palm_pts.reshape((-1, 1, 2))
+        palm_pts = local[self.palm_path].reshape((-1, 1, 2))
         
         # Fill the palm plate
         cv2.fillPoly(overlay, [palm_pts], base_red)
@@ -63,8 +71,3 @@ class Exoskeleton:
                 
             # Gold joint at fingertip
             cv2.circle(overlay, points[path[-1]], 14, gold, -1)
-
-        # Blend overlay onto frame only where the overlay has content (no darkening)
-        mask = cv2.cvtColor(overlay, cv2.COLOR_BGR2GRAY) > 0
-        blended = cv2.addWeighted(overlay, 0.6, frame, 0.4, 0)
-        frame[mask] = blended[mask]
\ No newline at end of file
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import hand_tracker
+from hand_tracker import HologramTracker, TIMESTAMP_JUMP_MS
+
+FRAME_MS = 33
+
+#clips start past 0, which the tracker reserves for warm_up()
+START_MS = 1000
+
+class FakeLandmarker:
+    """Stands in for a MediaPipe landmarker: finds nothing, remembers its timestamps."""
+
+    def __init__(self, result):
+        self.result = result
+        self.timestamps = []
+        self.closed = False
+
+    def detect_for_video(self, mp_image, timestamp_ms):
+        assert not self.closed
+        assert not self.timestamps or timestamp_ms > self.timestamps[-1]
+        self.timestamps.append(timestamp_ms)
+        return self.result
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def make_tracker(monkeypatch, tmp_path):
+    created = {"hand": [], "pose": []}
+
+    def create_hand(self):
+        created["hand"].append(FakeLandmarker(SimpleNamespace(hand_landmarks=[], handedness=[])))
+        return created["hand"][-1]
+
+    def create_pose(self):
+        created["pose"].append(FakeLandmarker(SimpleNamespace(pose_landmarks=[])))
+        return created["pose"][-1]
+
+    monkeypatch.setattr(hand_tracker.ModelStore, "verified_path", lambda store, name: str(tmp_path / name))
+    monkeypatch.setattr(HologramTracker, "_create_hand_detector", create_hand)
+    monkeypatch.setattr(HologramTracker, "_create_pose_detector", create_pose)
+
+    trackers = []
+
+    def make(**kwargs):
+        trackers.append(HologramTracker(running_mode="video", model_dir=str(tmp_path), **kwargs))
+        return trackers[-1], created
+
+    yield make
+    for tracker in trackers:
+        tracker.close()
+
+def run(tracker, frames, start_ms, want_pose=True):
+    t = start_ms
+    for frame in frames:
+        tracker.process_frame(frame, timestamp_ms=t, want_pose=want_pose)
+        t += FRAME_MS
+    return t
+
+def test_gated_frames_do_not_recreate_pose(make_tracker):
+    tracker, created = make_tracker(motion_gate=True)
+    still = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    # One real frame, then a static scene for well over TIMESTAMP_JUMP_MS
+    gated_frames = 2 * TIMESTAMP_JUMP_MS // FRAME_MS
+    t = run(tracker, [still] * (1 + gated_frames), START_MS)
+    assert tracker.motion_gate.gated == gated_frames
+
+    # Someone walks in: pose runs again on the landmarker it had all along
+    moving = [np.full_like(still, 255 * (i % 2)) for i in range(1, 2 * tracker.pose_interval + 1)]
+    run(tracker, moving, t)
+    assert len(created["hand"]) == 1
+    assert len(created["pose"]) == 1
+    assert created["pose"][0].timestamps[-1] > START_MS + TIMESTAMP_JUMP_MS
+
+def test_turning_pose_back_on_does_not_recreate_it(make_tracker):
+    tracker, created = make_tracker()
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    t = run(tracker, [frame] * 4, START_MS)
+    t = run(tracker, [frame] * (2 * TIMESTAMP_JUMP_MS // FRAME_MS), t, want_pose=False)
+    pose_calls = len(created["pose"][0].timestamps)
+    run(tracker, [frame] * 4, t)
+    assert len(created["pose"]) == 1
+    assert len(created["pose"][0].timestamps) > pose_calls
+
+def test_seeking_back_still_recreates_both_landmarkers(make_tracker):
+    tracker, created = make_tracker()
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    run(tracker, [frame] * 4, START_MS + 5000)
+    run(tracker, [frame] * 4, START_MS)
+    assert len(created["hand"]) == 2
+    assert len(created["pose"]) == 2
+    assert created["hand"][0].closed and created["pose"][0].closed
@@ -0,0 +1,50 @@
+import zipfile
+
+import pytest
+
+import model_store
+from model_store import ModelStore, file_digest
+
+HAND = "hand_landmarker.task"
+
+def make_bundle(path, payload=b"weights"):
+    with zipfile.ZipFile(path, "w") as bundle:
+        bundle.writestr("hand_landmarks_detector.tflite", payload)
+    return str(path)
+
+@pytest.fixture
+def bundle(tmp_path):
+    return make_bundle(tmp_path / HAND)
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    def fetch(name, dst):
+        raise AssertionError(f"tried to download {name}")
+    monkeypatch.setattr(model_store, "fetch", fetch)
+
+def test_install_accepts_the_pinned_file(tmp_path, bundle):
+    store = ModelStore(str(tmp_path / "store"), offline=True, pins={HAND: file_digest(bundle)})
+    store.install(HAND, bundle)
+    assert store.verified_path(HAND) == store.path(HAND)
+
+def test_install_rejects_a_file_that_does_not_match_its_pin(tmp_path, bundle):
+    other = make_bundle(tmp_path / "other.task", b"something else")
+    store = ModelStore(str(tmp_path / "store"), offline=True, pins={HAND: file_digest(bundle)})
+    with pytest.raises(ValueError):
+        store.install(HAND, other)
+    assert not (tmp_path / "store" / HAND).exists()
+
+def test_a_file_already_in_the_store_is_not_trusted_on_first_use(tmp_path, bundle):
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    make_bundle(store_dir / HAND, b"left behind by something else")
+    store = ModelStore(str(store_dir), offline=True, pins={HAND: file_digest(bundle)})
+    with pytest.raises(RuntimeError, match="offline"):
+        store.verified_path(HAND)
+
+def test_unpinned_models_are_refused(tmp_path, bundle):
+    store = ModelStore(str(tmp_path / "store"), pins={HAND: None})
+    with pytest.raises(RuntimeError, match="pin"):
+        store.verified_path(HAND)
+    with pytest.raises(RuntimeError, match="pin"):
+        store.install(HAND, bundle)